@@ -0,0 +1,371 @@
+import json
+import platform
+import random
+import time
+import numpy as np
+from datetime import datetime
+from pathlib import Path
+from .model import AetheriumBrain, NeuralNetwork
+from .optim import make_optimizer
+
+def synthetic_intents(vocab_size, intent_count, patterns_per_intent=20, seed=0):
+    """Build a random corpus with roughly vocab_size distinct words"""
+    rng = random.Random(seed)
+    words = [f"w{idx}" for idx in range(vocab_size)]
+    # Each intent draws mostly from its own slice of the vocabulary
+    slice_size = max(1, vocab_size // intent_count)
+    intents = []
+    for intent_idx in range(intent_count):
+        own = words[intent_idx * slice_size:(intent_idx + 1) * slice_size] or words
+        # Cover every word of the intent's slice at least once, then add mixed patterns
+        shuffled = rng.sample(own, len(own))
+        patterns = []
+        while shuffled:
+            length = rng.randint(2, 6)
+            patterns.append(" ".join(shuffled[:length]))
+            shuffled = shuffled[length:]
+        while len(patterns) < patterns_per_intent:
+            patterns.append(" ".join(
+                rng.choice(own if rng.random() < 0.8 else words) for _ in range(rng.randint(2, 6))
+            ))
+        intents.append({
+            "tag": f"intent_{intent_idx}",
+            "patterns": patterns,
+            "responses": [f"Response {intent_idx}"]
+        })
+    return intents
+
+def synthetic_queries(brain, count, seed=1):
+    """Random word combinations that mostly miss the exact-match index"""
+    rng = random.Random(seed)
+    words = list(brain.vocab) or ["empty"]
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(2, 8))) for _ in range(count)]
+
+def build_brain(intents, hidden_size=8, seed=0, feature_dim=None, feature_bigrams=False):
+    """An untrained brain over the given intents; latency does not depend on training"""
+    brain = AetheriumBrain(cache_size=0, autoload=False, feature_dim=feature_dim, feature_bigrams=feature_bigrams)
+    brain.intents = intents
+    brain.generate_vocabulary_from_intents(save=False)
+    brain.model = NeuralNetwork(brain.input_size(), hidden_size, len(intents), rng=np.random.default_rng(seed))
+    return brain
+
+def latency_summary(samples, items_per_sample=1):
+    samples = np.asarray(samples)
+    total = samples.sum()
+    return {
+        "calls": len(samples),
+        "p50_ms": float(np.percentile(samples, 50) * 1000),
+        "p95_ms": float(np.percentile(samples, 95) * 1000),
+        "p99_ms": float(np.percentile(samples, 99) * 1000),
+        "throughput_per_s": float(len(samples) * items_per_sample / total) if total else 0.0
+    }
+
+def time_calls(func, inputs):
+    samples = []
+    for item in inputs:
+        start = time.perf_counter()
+        func(item)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def benchmark_brain(brain, queries, batch_size=256):
+    """Latency of the single, batched, featurization and fallback paths"""
+    batches = [queries[i:i + batch_size] for i in range(0, len(queries), batch_size)]
+    # Warm up lazily compiled state (fallback rules, pattern index)
+    brain.predict_intents(queries[:batch_size])
+    brain.windows_rule_based_fallback(queries[0])
+
+    return {
+        "predict_intent": latency_summary(time_calls(brain.predict_intent, queries)),
+        "predict_intents": dict(
+            latency_summary(time_calls(brain.predict_intents, batches), batch_size),
+            batch_size=batch_size
+        ),
+        "text_to_vector": latency_summary(time_calls(brain.text_to_vector, queries)),
+        "text_to_indices": latency_summary(time_calls(brain.text_to_indices, queries)),
+        "windows_rule_based_fallback": latency_summary(time_calls(brain.windows_rule_based_fallback, queries))
+    }
+
+def run_suite(vocab_sizes=(200, 2000, 20000), intent_counts=(14, 50), queries=500, batch_size=256):
+    """Sweep synthetic corpus sizes and collect latency results"""
+    results = []
+    for vocab_size in vocab_sizes:
+        for intent_count in intent_counts:
+            print(f"⏱️  vocab={vocab_size} intents={intent_count}")
+            brain = build_brain(synthetic_intents(vocab_size, intent_count))
+            results.append({
+                "vocab_size": vocab_size,
+                "vocab_words": len(brain.vocab),
+                "intent_count": intent_count,
+                "timings": benchmark_brain(brain, synthetic_queries(brain, queries), batch_size)
+            })
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results
+    }
+
+def save_results(report, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    return path
+
+def compare_results(current, baseline, metric="p95_ms", tolerance=0.10):
+    """List timings that got slower than the baseline by more than tolerance"""
+    def keyed(report):
+        return {(r["vocab_size"], r["intent_count"]): r["timings"] for r in report["results"]}
+
+    base = keyed(baseline)
+    regressions = []
+    for key, timings in keyed(current).items():
+        if key not in base:
+            continue
+        for name, stats in timings.items():
+            before = base[key].get(name, {}).get(metric)
+            if before and stats[metric] > before * (1 + tolerance):
+                regressions.append({
+                    "vocab_size": key[0],
+                    "intent_count": key[1],
+                    "timing": name,
+                    "baseline": before,
+                    "current": stats[metric],
+                    "ratio": stats[metric] / before
+                })
+    return regressions
+
+def print_results(report):
+    print(f"{'Vocab':>7} {'Intents':>7} {'Timing':28} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'items/s':>11}")
+    for result in report["results"]:
+        for name, stats in result["timings"].items():
+            print(f"{result['vocab_size']:>7} {result['intent_count']:>7} {name:28} "
+                  f"{stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f} "
+                  f"{stats['throughput_per_s']:>11.0f}")
+
+CONVERGENCE_CONFIGS = (
+    ("sigmoid", "sgd", 0.1),
+    ("softmax", "sgd", 0.1),
+    ("softmax", "momentum", 0.05),
+    ("softmax", "adam", 0.01)
+)
+
+def benchmark_convergence(trainer, configs=CONVERGENCE_CONFIGS, target_accuracy=0.9, epochs=1000,
+                          batch_size=None, hidden_size=8, validation_split=0.1, seed=0):
+    """Epochs and wall time each (output, optimizer, learning rate) needs to reach a validation accuracy"""
+    X, labels = trainer.load_training_matrix()
+    train_rows, val_rows = trainer.split_validation(labels, validation_split, np.random.default_rng(seed))
+    X_train, labels_train = X.take(train_rows), labels[train_rows]
+    X_val, labels_val = (X.take(val_rows), labels[val_rows]) if len(val_rows) else (X_train, labels_train)
+    
+    results = []
+    for output, optimizer_name, learning_rate in configs:
+        print(f"⏱️  {output} + {optimizer_name} (lr={learning_rate:g})")
+        # Same initial weights and batch order for every configuration
+        rng = np.random.default_rng(seed)
+        model = NeuralNetwork(X.shape[1], hidden_size, int(labels.max()) + 1, output, rng)
+        optimizer = make_optimizer(optimizer_name, learning_rate)
+        
+        target_epoch = None
+        best_accuracy = 0.0
+        train_seconds = 0.0
+        for epoch in range(epochs):
+            start = time.perf_counter()
+            for X_batch, labels_batch in trainer.iterate_batches(X_train, labels_train, batch_size, True, rng):
+                trainer.train_step(model, X_batch, labels_batch, optimizer)
+            train_seconds += time.perf_counter() - start
+            
+            _, accuracy = trainer.evaluate(model, X_val, labels_val)
+            best_accuracy = max(best_accuracy, accuracy)
+            if accuracy >= target_accuracy:
+                target_epoch = epoch + 1
+                break
+        
+        results.append({
+            "output": output,
+            "optimizer": optimizer_name,
+            "learning_rate": learning_rate,
+            "epochs_to_target": target_epoch,
+            "train_seconds": train_seconds,
+            "best_val_accuracy": best_accuracy
+        })
+    return results
+
+def print_convergence(results, target_accuracy):
+    print(f"{'Output':8} {'Optimizer':9} {'LR':>7} {f'Epochs to {target_accuracy:.0%}':>15} {'Train s':>8} {'Best acc':>9}")
+    for r in results:
+        reached = r["epochs_to_target"] if r["epochs_to_target"] is not None else "never"
+        print(f"{r['output']:8} {r['optimizer']:9} {r['learning_rate']:>7g} {reached:>15} "
+              f"{r['train_seconds']:>8.2f} {r['best_val_accuracy']:>8.2%}")
+
+FEATURE_CONFIGS = (
+    (None, False),
+    (256, False),
+    (1024, False),
+    (1024, True)
+)
+
+def benchmark_features(intents, configs=FEATURE_CONFIGS, epochs=100, batch_size=32, hidden_size=8,
+                       validation_split=0.2, seed=0):
+    """Weight memory, featurization speed and validation accuracy of vocab-indexed vs hashed features"""
+    from .trainer import ModelTrainer
+    
+    results = []
+    for feature_dim, bigrams in configs:
+        name = f"hashed {feature_dim}" + (" +bigrams" if bigrams else "") if feature_dim else "vocab"
+        print(f"⏱️  {name}")
+        brain = build_brain(intents, hidden_size, seed, feature_dim, bigrams)
+        trainer = ModelTrainer(brain)
+        patterns = [pattern for intent in intents for pattern in intent['patterns']]
+        
+        start = time.perf_counter()
+        X, labels = trainer.generate_training_matrix()
+        featurize_seconds = time.perf_counter() - start
+        
+        rng = np.random.default_rng(seed)
+        train_rows, val_rows = trainer.split_validation(labels, validation_split, rng)
+        X_train, labels_train = X.take(train_rows), labels[train_rows]
+        X_val, labels_val = X.take(val_rows), labels[val_rows]
+        
+        # The same head and optimizer for every featurizer; only the inputs differ
+        model = NeuralNetwork(brain.input_size(), hidden_size, len(intents), "softmax", rng)
+        optimizer = make_optimizer("adam", 0.01)
+        start = time.perf_counter()
+        for _ in range(epochs):
+            for X_batch, labels_batch in trainer.iterate_batches(X_train, labels_train, batch_size, True, rng):
+                trainer.train_step(model, X_batch, labels_batch, optimizer)
+        train_seconds = time.perf_counter() - start
+        _, val_accuracy = trainer.evaluate(model, X_val, labels_val)
+        
+        # Random word mixes miss the exact-match index, so every query is featurized and scored
+        brain.model = model
+        queries = synthetic_queries(brain, 2048, seed)
+        timings = time_calls(brain.predict_intents, [queries[i:i + 256] for i in range(0, len(queries), 256)])
+        results.append({
+            "features": name,
+            "input_size": brain.input_size(),
+            "weight_bytes": model.nbytes(),
+            "vocab_bytes": len(json.dumps(brain.vocab)) if brain.featurizer is None else 0,
+            "featurize_us": featurize_seconds / len(patterns) * 1e6,
+            "predict_batch_ms": float(np.median(timings) * 1000),
+            "train_seconds": train_seconds,
+            "val_accuracy": val_accuracy
+        })
+    return results
+
+def print_features(results):
+    print(f"{'Features':20} {'Inputs':>7} {'Weights KB':>11} {'Vocab KB':>9} {'Featurize us':>13} "
+          f"{'Batch ms':>9} {'Train s':>8} {'Val acc':>8}")
+    for r in results:
+        print(f"{r['features']:20} {r['input_size']:>7} {r['weight_bytes'] / 1024:>11.1f} {r['vocab_bytes'] / 1024:>9.1f} "
+              f"{r['featurize_us']:>13.2f} {r['predict_batch_ms']:>9.3f} {r['train_seconds']:>8.2f} {r['val_accuracy']:>7.2%}")
+
+def benchmark_augmentation(budgets=(None, 400, 100, 25), epochs=30, batch_size=32, hidden_size=8, seed=0):
+    """Corpus size, training time and accuracy of generated data at several per-intent budgets
+    
+    Every model is scored on the full unbudgeted corpus and on the variants
+    its budget left out; budgets keep the vocabulary, so one matrix serves all.
+    """
+    from .data_generator import TrainingDataGenerator
+    from .trainer import ModelTrainer
+    
+    full = TrainingDataGenerator(seed).build()
+    full_labels = np.array(full["labels"])
+    full_patterns = [(intent["tag"], pattern) for intent in full["intents"] for pattern in intent["patterns"]]
+    trainer = ModelTrainer(None)
+    
+    results = []
+    for budget in budgets:
+        print(f"⏱️  budget={budget or 'all'}")
+        start = time.perf_counter()
+        build = TrainingDataGenerator(seed, budget).build()
+        build_seconds = time.perf_counter() - start
+        # Budgets only drop variants whose words are already covered, so the vocabulary must not shrink
+        if build["vocab"] != full["vocab"]:
+            missing = sorted(set(full["vocab"]) - set(build["vocab"]))
+            raise ValueError(f"Budget {budget} lost vocabulary words: {', '.join(missing[:10])}")
+        
+        X, labels = build["matrix"], np.array(build["labels"])
+        rng = np.random.default_rng(seed)
+        model = NeuralNetwork(X.shape[1], hidden_size, len(build["intents"]), "softmax", rng)
+        optimizer = make_optimizer("adam", 0.01)
+        start = time.perf_counter()
+        for _ in range(epochs):
+            for X_batch, labels_batch in trainer.iterate_batches(X, labels, batch_size, True, rng):
+                trainer.train_step(model, X_batch, labels_batch, optimizer)
+        train_seconds = time.perf_counter() - start
+        
+        kept = {(intent["tag"], pattern) for intent in build["intents"] for pattern in intent["patterns"]}
+        unseen = np.array([row for row, key in enumerate(full_patterns) if key not in kept], dtype=np.int64)
+        _, full_accuracy = trainer.evaluate(model, full["matrix"], full_labels)
+        unseen_accuracy = (trainer.evaluate(model, full["matrix"].take(unseen), full_labels[unseen])[1]
+                           if len(unseen) else None)
+        
+        results.append({
+            "budget": budget,
+            "patterns": len(labels),
+            "vocab_size": len(build["vocab"]),
+            "nnz": X.nnz,
+            "corpus_bytes": len(json.dumps({"intents": build["intents"]}, indent=2)),
+            "build_seconds": build_seconds,
+            "train_seconds": train_seconds,
+            "full_accuracy": full_accuracy,
+            "unseen_accuracy": unseen_accuracy
+        })
+    return results
+
+def print_augmentation(results):
+    print(f"{'Budget':>7} {'Patterns':>9} {'Vocab':>6} {'Corpus KB':>10} {'Build s':>8} {'Train s':>8} "
+          f"{'Full acc':>9} {'Unseen acc':>11}")
+    for r in results:
+        unseen = f"{r['unseen_accuracy']:.2%}" if r["unseen_accuracy"] is not None else "-"
+        print(f"{r['budget'] or 'all':>7} {r['patterns']:>9} {r['vocab_size']:>6} {r['corpus_bytes'] / 1024:>10.1f} "
+              f"{r['build_seconds']:>8.2f} {r['train_seconds']:>8.2f} {r['full_accuracy']:>8.2%} {unseen:>11}")
+
+TOKENIZER_CONFIGS = (
+    ("whitespace split", {"strip_punctuation": False}),
+    ("normalized", {}),
+    ("normalized + stem", {"stem": True})
+)
+
+def benchmark_tokenizers(intents, configs=TOKENIZER_CONFIGS, hidden_size=8, seed=0, repeats=3):
+    """Vocabulary size, weight memory and featurization time per tokenizer, on given and generated intents"""
+    from .data_generator import TrainingDataGenerator
+    from .tokenizer import Tokenizer
+    
+    results = []
+    for name, options in configs:
+        tokenizer = Tokenizer(**options)
+        generated = TrainingDataGenerator(seed, tokenizer=tokenizer).build()["intents"]
+        for source, source_intents in (("bundled", intents), ("generated", generated)):
+            brain = AetheriumBrain(cache_size=0, autoload=False)
+            brain.tokenizer = tokenizer
+            brain.intents = source_intents
+            brain.generate_vocabulary_from_intents(save=False)
+            patterns = [pattern for intent in source_intents for pattern in intent['patterns']]
+            
+            samples = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                matrix = brain.texts_to_matrix(patterns)
+                samples.append(time.perf_counter() - start)
+            
+            results.append({
+                "tokenizer": name,
+                "source": source,
+                "patterns": len(patterns),
+                "vocab_size": len(brain.vocab),
+                "weight_bytes": NeuralNetwork(brain.input_size(), hidden_size, len(source_intents)).nbytes(),
+                "nnz": matrix.nnz,
+                "featurize_us": min(samples) / len(patterns) * 1e6
+            })
+    return results
+
+def print_tokenizers(results):
+    print(f"{'Tokenizer':18} {'Source':10} {'Patterns':>9} {'Vocab':>6} {'Weights KB':>11} {'Non-zeros':>10} {'Featurize us':>13}")
+    for r in results:
+        print(f"{r['tokenizer']:18} {r['source']:10} {r['patterns']:>9} {r['vocab_size']:>6} "
+              f"{r['weight_bytes'] / 1024:>11.1f} {r['nnz']:>10} {r['featurize_us']:>13.2f}")
@@ -0,0 +1,112 @@
+"""
+Single-file model bundle: a JSON header followed by raw, aligned arrays.
+
+Layout (little endian):
+    magic (8 bytes) | format version (uint32) | header length (uint32)
+    | JSON header | padding | array data, each array 64-byte aligned
+
+The header lists each array's dtype, shape and offset within the data
+section, plus free-form metadata (vocab, intents, hyperparameters). No
+pickle is involved, and arrays are memory-mapped read-only on load.
+"""
+
+import json
+import os
+import struct
+import numpy as np
+from pathlib import Path
+
+MAGIC = b"AETHBNDL"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+PREFIX = struct.Struct("<8sII")
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def save_bundle(path, arrays, meta=None):
+    """Write arrays and metadata to a single bundle file atomically"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    table = {}
+    offset = 0
+    contiguous = {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        if array.dtype.hasobject:
+            raise ValueError(f"Array '{name}' has object dtype and cannot be bundled")
+        contiguous[name] = array
+        table[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = _align(offset + array.nbytes)
+
+    header = json.dumps({
+        "format_version": FORMAT_VERSION,
+        "arrays": table,
+        "meta": meta or {}
+    }).encode('utf-8')
+    data_start = _align(PREFIX.size + len(header))
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(PREFIX.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        for name, array in contiguous.items():
+            f.seek(data_start + table[name]["offset"])
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+
+def read_bundle_header(path):
+    """Return (header, data_start) without touching the array data"""
+    with open(path, 'rb') as f:
+        magic, version, header_len = PREFIX.unpack(f.read(PREFIX.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an Aetherium model bundle")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"{path} uses bundle format v{version}, this build reads up to v{FORMAT_VERSION}")
+        header = json.loads(f.read(header_len).decode('utf-8'))
+    return header, _align(PREFIX.size + header_len)
+
+def load_bundle(path, mmap=True):
+    """Load a bundle, returning (arrays, meta); arrays are read-only memory maps by default"""
+    header, data_start = read_bundle_header(path)
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        count = int(np.prod(shape))
+        if count == 0:
+            arrays[name] = np.empty(shape, dtype=dtype)
+        elif mmap:
+            arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=data_start + spec["offset"], shape=shape)
+        else:
+            with open(path, 'rb') as f:
+                f.seek(data_start + spec["offset"])
+                arrays[name] = np.fromfile(f, dtype=dtype, count=count).reshape(shape)
+    return arrays, header["meta"]
+
+def convert_legacy_model(model_path, vocab_path, intents_path, bundle_path):
+    """Convert the pickled .npy weights plus vocab/intents JSON into a bundle"""
+    from .hashing import sha256_json
+    from .tokenizer import legacy_tokenizer
+
+    # The legacy format is a pickled dict; only load it from trusted files
+    weights = np.load(model_path, allow_pickle=True).item()
+    with open(vocab_path, 'r') as f:
+        vocab = json.load(f)
+    with open(intents_path, 'r') as f:
+        intents = json.load(f)["intents"]
+
+    arrays = {name: np.asarray(weights[name], dtype=np.float64) for name in ('weights1', 'weights2', 'bias1', 'bias2')}
+    if arrays['weights1'].shape[0] != len(vocab) or arrays['weights2'].shape[1] != len(intents):
+        raise ValueError("Legacy weights do not match the vocabulary and intents on disk")
+
+    save_bundle(bundle_path, arrays, {
+        "vocab": vocab,
+        "intents": intents,
+        "data_hash": sha256_json(intents),
+        # Legacy vocabularies were built with lower().split()
+        "features": {"type": "vocab", "tokenizer": legacy_tokenizer().spec()}
+    })
+    return bundle_path
@@ -1,9 +1,40 @@
 import json
 import random
 from pathlib import Path
+from .features import SparseMatrix
+from .tokenizer import Tokenizer
+
+VARIATION_TEMPLATES = (
+    # Basic variations
+    "{}", "{} please", "can you {}", "how to {}", "I want to {}", "show me how to {}",
+    "help me {}", "please {}", "could you {}", "would you {}",
+    # Question forms
+    "what is {}", "how do I {}", "how can I {}",
+    # With different punctuation
+    "{}?", "{}!"
+)
+
+FILE_EXTENSIONS = (".txt", ".py", ".js", ".html", ".css", ".json", ".csv")
+COMMON_FILENAMES = ("test", "file", "document", "data", "script", "config")
+
+# The brain owns intents.json and vocab.json (derived from the Windows command
+# data), so the generated corpus gets its own files and neither rewrites the other's
+GENERATED_INTENTS_PATH = Path("brain/data/generated_intents.json")
+GENERATED_VOCAB_PATH = Path("brain/data/generated_vocab.json")
 
 class TrainingDataGenerator:
-    def __init__(self):
+    """Expands base_intents into training intents, vocabulary and feature matrix in one seeded pass
+    
+    Expansion is a chain of generators with first-seen dedup, so pattern order,
+    and therefore the written files, depend only on base_intents, the seed and
+    the budget. base_intents is never modified.
+    """
+    
+    def __init__(self, seed=0, budget=None, tokenizer=None):
+        self.seed = seed
+        self.budget = budget
+        self.tokenizer = tokenizer or Tokenizer()
+        self.built = None
         self.base_intents = {
             "greeting": {
                 "patterns": [
@@ -122,90 +153,130 @@ class TrainingDataGenerator:
             }
         }
     
+    def iter_variations(self, pattern):
+        """(template index, phrasing) pairs for one pattern, in a fixed order"""
+        for template_idx, template in enumerate(VARIATION_TEMPLATES):
+            yield template_idx, template.format(pattern)
+        # Capitalized
+        yield len(VARIATION_TEMPLATES), pattern.capitalize()
+    
     def generate_variations(self, base_patterns):
-        variations = set()
-        
-        for pattern in base_patterns:
-            # Basic variations
-            variations.add(pattern)
-            variations.add(pattern + " please")
-            variations.add("can you " + pattern)
-            variations.add("how to " + pattern)
-            variations.add("I want to " + pattern)
-            variations.add("show me how to " + pattern)
-            variations.add("help me " + pattern)
-            variations.add("please " + pattern)
-            variations.add("could you " + pattern)
-            variations.add("would you " + pattern)
-            
-            # Question forms
-            variations.add("what is " + pattern)
-            variations.add("how do I " + pattern)
-            variations.add("how can I " + pattern)
-            
-            # With different punctuation
-            variations.add(pattern + "?")
-            variations.add(pattern + "!")
+        return list(dict.fromkeys(variation for pattern in base_patterns for _, variation in self.iter_variations(pattern)))
+    
+    def iter_contextual_patterns(self, tag, patterns, rng):
+        """Patterns with file extensions and common file names, for file/python/script intents"""
+        if not any(keyword in tag for keyword in ["file", "python", "script"]):
+            return
+        for pattern in patterns:
+            # Add patterns with file extensions
+            for ext in FILE_EXTENSIONS:
+                yield pattern + ext
+                yield pattern + " " + rng.choice(COMMON_FILENAMES) + ext
             
-            # Capitalized
-            variations.add(pattern.capitalize())
-        
-        return list(variations)
+            # Add patterns with specific filenames
+            for name in COMMON_FILENAMES:
+                yield pattern + " " + name
+                yield pattern + " " + name + ".txt"
     
     def generate_contextual_patterns(self):
         """Generate patterns with file extensions and common contexts"""
+        rng = random.Random(self.seed)
         contextual_patterns = {}
-        
-        file_extensions = [".txt", ".py", ".js", ".html", ".css", ".json", ".csv"]
-        common_filenames = ["test", "file", "document", "data", "script", "config"]
-        
         for tag, data in self.base_intents.items():
-            if any(keyword in tag for keyword in ["file", "python", "script"]):
-                enhanced_patterns = []
-                for pattern in data["patterns"]:
-                    # Add patterns with file extensions
-                    for ext in file_extensions:
-                        enhanced_patterns.append(pattern + ext)
-                        enhanced_patterns.append(pattern + " " + random.choice(common_filenames) + ext)
-                    
-                    # Add patterns with specific filenames
-                    for name in common_filenames:
-                        enhanced_patterns.append(pattern + " " + name)
-                        enhanced_patterns.append(pattern + " " + name + ".txt")
-                
-                contextual_patterns[tag] = enhanced_patterns
-        
+            patterns = list(self.iter_contextual_patterns(tag, data["patterns"], rng))
+            if patterns:
+                contextual_patterns[tag] = patterns
         return contextual_patterns
     
-    def generate_training_data(self):
-        intents = []
+    def iter_intent_patterns(self, tag, data, rng):
+        """(pattern, template index, is base pattern) for one intent, duplicates removed in first-seen order"""
+        # Variants that only differ in case or punctuation ("files?", "Files") tokenize
+        # identically, so they count as duplicates
+        seen = set()
+        sources = ((data["patterns"], True), (self.iter_contextual_patterns(tag, data["patterns"], rng), False))
+        for source, is_base in sources:
+            for base_pattern in source:
+                for template_idx, pattern in self.iter_variations(base_pattern):
+                    key = self.tokenizer.normalize(pattern)
+                    if key not in seen:
+                        seen.add(key)
+                        yield pattern, template_idx, is_base and template_idx == 0
+    
+    def select_patterns(self, candidates, budget, rng):
+        """Keep base patterns and any pattern with a token the intent has not covered yet,
+        then fill up to `budget` by sampling the other variants evenly across templates"""
+        required = []
+        optional = {}
+        covered = set()
+        for position, (pattern, template_idx, is_base) in enumerate(candidates):
+            tokens = self.tokenizer.tokenize(pattern)
+            if is_base or not covered.issuperset(tokens):
+                covered.update(tokens)
+                required.append((position, pattern))
+            else:
+                optional.setdefault(template_idx, []).append((position, pattern))
+        
+        # Round-robin over templates so no single phrasing dominates the sample
+        pools = [rng.sample(pool, len(pool)) for _, pool in sorted(optional.items())]
+        chosen = []
+        remaining = max(0, budget - len(required))
+        while remaining and pools:
+            for pool in pools:
+                if remaining and pool:
+                    chosen.append(pool.pop())
+                    remaining -= 1
+            pools = [pool for pool in pools if pool]
         
-        # Generate contextual patterns first
-        contextual_patterns = self.generate_contextual_patterns()
+        return [pattern for _, pattern in sorted(required + chosen)]
+    
+    def build(self):
+        """Run the expansion once; returns intents, vocab, feature matrix and labels together"""
+        if self.built:
+            return self.built
         
+        rng = random.Random(self.seed)
+        # Sampling draws from its own generator so budgets never change the expansion itself
+        sample_rng = random.Random(self.seed)
+        intents = []
+        words = set()
+        rows = []
         for tag, data in self.base_intents.items():
-            # Get base patterns
-            base_patterns = data["patterns"]
-            
-            # Add contextual patterns if available
-            if tag in contextual_patterns:
-                base_patterns.extend(contextual_patterns[tag])
-            
-            # Generate variations
-            enhanced_patterns = self.generate_variations(base_patterns)
-            
-            # Remove duplicates and ensure uniqueness
-            unique_patterns = list(set(enhanced_patterns))
-            
+            candidates = self.iter_intent_patterns(tag, data, rng)
+            if self.budget is None:
+                patterns = [pattern for pattern, _, _ in candidates]
+            else:
+                patterns = self.select_patterns(candidates, self.budget, sample_rng)
+            for pattern in patterns:
+                tokens = self.tokenizer.tokenize(pattern)
+                words.update(tokens)
+                rows.append(tokens)
             intents.append({
                 "tag": tag,
-                "patterns": unique_patterns,
-                "responses": data["responses"]
+                "patterns": patterns,
+                "responses": list(data["responses"])
             })
         
-        return {"intents": intents}
+        vocab = {word: idx for idx, word in enumerate(sorted(words))}
+        
+        def featurized(tokens):
+            counts = {}
+            for word in tokens:
+                counts[vocab[word]] = counts.get(vocab[word], 0) + 1
+            return list(counts.keys()), list(counts.values())
+        
+        labels = [intent_idx for intent_idx, intent in enumerate(intents) for _ in intent["patterns"]]
+        self.built = {
+            "intents": intents,
+            "vocab": vocab,
+            "matrix": SparseMatrix.from_rows((featurized(tokens) for tokens in rows), len(vocab)),
+            "labels": labels
+        }
+        return self.built
+    
+    def generate_training_data(self):
+        return {"intents": self.build()["intents"]}
     
-    def save_to_file(self, filename="brain/data/intents.json"):
+    def save_to_file(self, filename=GENERATED_INTENTS_PATH):
         data = self.generate_training_data()
         Path(filename).parent.mkdir(parents=True, exist_ok=True)
         
@@ -222,23 +293,11 @@ class TrainingDataGenerator:
         for intent in data["intents"]:
             print(f"   • {intent['tag']}: {len(intent['patterns'])} patterns")
     
-    def generate_vocabulary(self):
-        """Generate vocabulary from all patterns"""
-        all_patterns = []
-        for intent in self.generate_training_data()["intents"]:
-            all_patterns.extend(intent["patterns"])
-        
-        # Extract all unique words
-        all_words = set()
-        for pattern in all_patterns:
-            words = pattern.lower().split()
-            all_words.update(words)
-        
-        # Create vocabulary mapping
-        vocabulary = {word: idx for idx, word in enumerate(sorted(all_words))}
+    def generate_vocabulary(self, vocab_path=GENERATED_VOCAB_PATH):
+        """Save the vocabulary built alongside the intents"""
+        vocabulary = self.build()["vocab"]
         
         # Save vocabulary
-        vocab_path = Path("brain/data/vocab.json")
         with open(vocab_path, 'w') as f:
             json.dump(vocabulary, f, indent=2)
         
@@ -246,15 +305,12 @@ class TrainingDataGenerator:
         return vocabulary
 
 # Standalone function to generate data
-def generate_training_data():
+def generate_training_data(seed=0, budget=None, stem=False):
     """Generate training data and vocabulary"""
     print("🧠 Generating training data for Aetherium AI...")
     
-    generator = TrainingDataGenerator()
+    generator = TrainingDataGenerator(seed, budget, Tokenizer(stem=stem))
     generator.save_to_file()
     generator.generate_vocabulary()
     
     print("🎉 Training data generation complete!")
-
-if __name__ == "__main__":
-    generate_training_data()
\ No newline at end of file
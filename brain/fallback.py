@@ -0,0 +1,99 @@
+import json
+from pathlib import Path
+from .tokenizer import Tokenizer
+
+DEFAULT_RESPONSE = {"tag": "unknown", "response": "I'm not sure about that Windows command."}
+
+class KeywordMatcher:
+    """Aho-Corasick automaton that reports the highest-priority keyword in a text"""
+
+    def __init__(self, keywords):
+        # keywords: iterable of (keyword, priority); lower priority wins
+        self.goto = [{}]
+        self.fail = [0]
+        self.best = [None]
+
+        for keyword, priority in keywords:
+            state = 0
+            for char in keyword:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.best.append(None)
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            if self.best[state] is None or priority < self.best[state]:
+                self.best[state] = priority
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                # A state also matches everything its failure state matches
+                inherited = self.best[self.fail[child]]
+                if inherited is not None and (self.best[child] is None or inherited < self.best[child]):
+                    self.best[child] = inherited
+
+    def search(self, text):
+        """Return the lowest priority found anywhere in text, or None"""
+        goto, fail, best = self.goto, self.fail, self.best
+        state = 0
+        found = None
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            priority = best[state]
+            if priority is not None and (found is None or priority < found):
+                found = priority
+                if found == 0:
+                    break
+        return found
+
+class RuleBasedFallback:
+    """Keyword rules compiled once into a single matcher, checked in rule order"""
+
+    def __init__(self, rules, default=None, tokenizer=None):
+        self.rules = rules
+        self.default = default or DEFAULT_RESPONSE
+        # Keywords and inputs go through the same normalization, so "netstat!" still finds "netstat"
+        self.tokenizer = tokenizer or Tokenizer()
+        self.matcher = KeywordMatcher(
+            (self.tokenizer.normalize(keyword), priority)
+            for priority, rule in enumerate(rules)
+            for keyword in rule["keywords"]
+        )
+        self.commands = [set(rule.get("commands", [])) for rule in rules]
+
+    @classmethod
+    def load(cls, path):
+        """Load rules from a JSON file"""
+        path = Path(path)
+        if not path.exists():
+            print(f"⚠️  Fallback rules not found at {path}")
+            return cls([])
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return cls(data["rules"], data.get("default"))
+
+    def match(self, text):
+        normalized = self.tokenizer.normalize(text)
+        priority = self.matcher.search(normalized)
+        if priority is None:
+            return dict(self.default)
+
+        rule = self.rules[priority]
+        if self.commands[priority]:
+            # Extract the actual command to run
+            command = next((word for word in normalized.split() if word in self.commands[priority]), None)
+            if command:
+                return {"tag": rule["tag"], "response": rule["command_response"].format(command=command)}
+
+        return {"tag": rule["tag"], "response": rule["response"]}
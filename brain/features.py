@@ -0,0 +1,99 @@
+import zlib
+import numpy as np
+
+class SparseMatrix:
+    """Minimal CSR matrix for bag-of-words features"""
+
+    def __init__(self, data, indices, indptr, shape):
+        self.data = np.asarray(data, dtype=np.float64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.shape = (int(shape[0]), int(shape[1]))
+
+    @classmethod
+    def from_rows(cls, rows, n_cols):
+        """Build a matrix from a sequence of (indices, values) pairs"""
+        indptr = [0]
+        indices = []
+        data = []
+        for row_indices, row_values in rows:
+            indices.extend(row_indices)
+            data.extend(row_values)
+            indptr.append(len(indices))
+        return cls(data, indices, indptr, (len(indptr) - 1, n_cols))
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def row_counts(self):
+        return np.diff(self.indptr)
+
+    def take(self, rows):
+        """Return a new matrix holding the given rows, in order"""
+        rows = np.asarray(rows, dtype=np.int64)
+        starts = self.indptr[rows]
+        counts = self.indptr[rows + 1] - starts
+        indptr = np.concatenate(([0], np.cumsum(counts)))
+        positions = np.repeat(starts - indptr[:-1], counts) + np.arange(indptr[-1])
+        return SparseMatrix(self.data[positions], self.indices[positions], indptr, (len(rows), self.shape[1]))
+
+    def dot(self, dense, dtype=None):
+        """Sparse x dense product, cost proportional to the stored entries"""
+        dense = np.asarray(dense)
+        dtype = dtype or np.result_type(self.data, dense)
+        out = np.zeros((self.shape[0], dense.shape[1]), dtype=dtype)
+        if self.nnz:
+            # Only the referenced weight rows are gathered and upcast
+            contributions = self.data.astype(dtype)[:, None] * dense[self.indices].astype(dtype)
+            nonempty = self.row_counts() > 0
+            out[nonempty] = np.add.reduceat(contributions, self.indptr[:-1][nonempty], axis=0)
+        return out
+
+    def transpose_dot(self, dense):
+        """Compute X.T x dense without materializing the transpose"""
+        dense = np.asarray(dense)
+        out = np.zeros((self.shape[1], dense.shape[1]), dtype=np.result_type(self.data, dense))
+        if self.nnz:
+            rows = np.repeat(np.arange(self.shape[0]), self.row_counts())
+            np.add.at(out, self.indices, self.data[:, None] * dense[rows])
+        return out
+
+    def toarray(self):
+        out = np.zeros(self.shape)
+        rows = np.repeat(np.arange(self.shape[0]), self.row_counts())
+        np.add.at(out, (rows, self.indices), self.data)
+        return out
+
+class HashedFeaturizer:
+    """Feature hashing: words (and optionally word bigrams) map to a fixed number of signed buckets
+
+    The input width no longer depends on a vocabulary, so new words never
+    reshape the weights and no vocab lookup is needed at inference.
+    """
+
+    def __init__(self, dimension=4096, bigrams=False):
+        self.dimension = int(dimension)
+        self.bigrams = bool(bigrams)
+
+    def spec(self):
+        return {"type": "hashed", "dimension": self.dimension, "bigrams": self.bigrams}
+
+    def tokens_to_indices(self, words):
+        tokens = words + [f"{first} {second}" for first, second in zip(words, words[1:])] if self.bigrams else words
+        counts = {}
+        for token in tokens:
+            digest = zlib.crc32(token.encode('utf-8'))
+            idx = digest % self.dimension
+            # The top bit picks the sign so colliding tokens cancel on average
+            counts[idx] = counts.get(idx, 0) + (1 if digest >> 31 else -1)
+        counts = {idx: value for idx, value in counts.items() if value}
+        return list(counts.keys()), list(counts.values())
+
+def make_featurizer(spec):
+    """Featurizer for a bundle's "features" spec; None means vocabulary indices"""
+    if not spec or spec.get("type", "vocab") == "vocab":
+        return None
+    if spec["type"] == "hashed":
+        return HashedFeaturizer(spec["dimension"], spec.get("bigrams", False))
+    raise ValueError(f"Unknown feature type '{spec['type']}'")
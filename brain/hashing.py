@@ -0,0 +1,17 @@
+import hashlib
+import json
+
+def sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+def sha256_file(path, chunk_size=1 << 20):
+    """Content hash of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def sha256_json(obj):
+    """Hash of a JSON-serializable object, independent of key order and formatting"""
+    return sha256_bytes(json.dumps(obj, sort_keys=True, separators=(',', ':')).encode('utf-8'))
@@ -1,37 +1,234 @@
 import numpy as np
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from .features import SparseMatrix, HashedFeaturizer, make_featurizer
+from .fallback import RuleBasedFallback
+from .cache import LRUCache
+from .bundle import save_bundle, load_bundle, convert_legacy_model
+from .hashing import sha256_bytes, sha256_file, sha256_json
+from .tokenizer import Tokenizer, make_tokenizer
+
+PRECISIONS = ("float64", "float32", "int8")
+
+def quantize_columns(weights):
+    """Symmetric int8 quantization with one float32 scale per output column"""
+    weights = np.asarray(weights, dtype=np.float64)
+    scale = np.max(np.abs(weights), axis=0, keepdims=True) / 127.0
+    scale[scale == 0] = 1.0
+    quantized = np.clip(np.rint(weights / scale), -127, 127).astype(np.int8)
+    return quantized, scale.astype(np.float32)
+
+OUTPUTS = ("sigmoid", "softmax")
 
 class NeuralNetwork:
-    def __init__(self, input_size, hidden_size, output_size):
-        self.weights1 = np.random.randn(input_size, hidden_size)
-        self.weights2 = np.random.randn(hidden_size, output_size)
+    def __init__(self, input_size, hidden_size, output_size, output="sigmoid", rng=None):
+        # A Generator makes the initial weights depend on its seed alone
+        normal = rng.standard_normal if rng is not None else np.random.standard_normal
+        self.weights1 = normal((input_size, hidden_size))
+        self.weights2 = normal((hidden_size, output_size))
         self.bias1 = np.zeros((1, hidden_size))
         self.bias2 = np.zeros((1, output_size))
+        self.output = output
+        self.precision = "float64"
+        self.scale1 = None
+        self.scale2 = None
+    
+    @classmethod
+    def from_weights(cls, weights1, weights2, bias1, bias2, precision="float64", scale1=None, scale2=None,
+                     output="sigmoid"):
+        """Build a network around existing weight arrays without random init"""
+        model = cls.__new__(cls)
+        model.weights1 = weights1
+        model.weights2 = weights2
+        model.bias1 = bias1
+        model.bias2 = bias2
+        model.output = output
+        model.precision = precision
+        model.scale1 = scale1
+        model.scale2 = scale2
+        return model
+    
+    def weight_arrays(self):
+        arrays = {
+            'weights1': self.weights1,
+            'weights2': self.weights2,
+            'bias1': self.bias1,
+            'bias2': self.bias2
+        }
+        if self.precision == "int8":
+            arrays['scale1'] = self.scale1
+            arrays['scale2'] = self.scale2
+        return arrays
+    
+    def dequantized(self, name):
+        """Return a weight matrix as floats, undoing int8 quantization if needed"""
+        weights = getattr(self, name)
+        if self.precision == "int8":
+            scale = self.scale1 if name == 'weights1' else self.scale2
+            return weights.astype(np.float64) * scale
+        return np.asarray(weights, dtype=np.float64)
+    
+    def to_precision(self, precision):
+        """Return a copy of this network for float64, float32 or int8 inference"""
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision '{precision}', expected one of {PRECISIONS}")
+        
+        weights1 = self.dequantized('weights1')
+        weights2 = self.dequantized('weights2')
+        bias1 = np.asarray(self.bias1, dtype=np.float64)
+        bias2 = np.asarray(self.bias2, dtype=np.float64)
+        if precision == "float64":
+            return NeuralNetwork.from_weights(weights1, weights2, bias1, bias2, output=self.output)
+        if precision == "float32":
+            return NeuralNetwork.from_weights(
+                weights1.astype(np.float32), weights2.astype(np.float32),
+                bias1.astype(np.float32), bias2.astype(np.float32), "float32", output=self.output
+            )
+        
+        quantized1, scale1 = quantize_columns(weights1)
+        quantized2, scale2 = quantize_columns(weights2)
+        return NeuralNetwork.from_weights(
+            quantized1, quantized2, bias1.astype(np.float32), bias2.astype(np.float32),
+            "int8", scale1, scale2, output=self.output
+        )
+    
+    def nbytes(self):
+        return sum(array.nbytes for array in self.weight_arrays().values())
         
     def sigmoid(self, x):
-        return 1 / (1 + np.exp(-x))
+        # tanh form is exact and never overflows, unlike 1 / (1 + exp(-x))
+        return 0.5 * (1.0 + np.tanh(0.5 * x))
+    
+    def softmax(self, x):
+        exp = np.exp(x - np.max(x, axis=1, keepdims=True))
+        return exp / np.sum(exp, axis=1, keepdims=True)
+    
+    def linear(self, X, weights, bias, scale=None):
+        dtype = np.float64 if self.precision == "float64" else np.float32
+        if isinstance(X, SparseMatrix):
+            # Sparse inputs only touch the weight rows of words that occur
+            projected = X.dot(weights, dtype=dtype)
+        else:
+            projected = np.dot(np.asarray(X, dtype=dtype), weights.astype(dtype, copy=False))
+        if scale is not None:
+            projected *= scale
+        return projected + bias
     
     def forward(self, X):
-        self.hidden = self.sigmoid(np.dot(X, self.weights1) + self.bias1)
-        output = self.sigmoid(np.dot(self.hidden, self.weights2) + self.bias2)
-        return output
+        # Activations stay local so concurrent callers never share state
+        hidden = self.sigmoid(self.linear(X, self.weights1, self.bias1, self.scale1))
+        logits = self.linear(hidden, self.weights2, self.bias2, self.scale2)
+        return self.softmax(logits) if self.output == "softmax" else self.sigmoid(logits)
     
     def predict(self, X):
         return self.forward(X)
 
+def bundle_network(arrays, meta):
+    """Wrap bundle arrays in a NeuralNetwork at the bundle's own precision"""
+    return NeuralNetwork.from_weights(
+        arrays['weights1'], arrays['weights2'], arrays['bias1'], arrays['bias2'],
+        meta.get("precision", "float64"), arrays.get('scale1'), arrays.get('scale2'),
+        meta.get("output", "sigmoid")
+    )
+
 class AetheriumBrain:
-    def __init__(self):
+    def __init__(self, cache_size=1024, precision="float64", autoload=True, confidence_threshold=0.3,
+                 feature_dim=None, feature_bigrams=False, stem=False):
+        self.prediction_cache = LRUCache(cache_size)
+        self.index_lookups = 0
+        self.index_hits = 0
+        self.stats_lock = threading.Lock()
+        self.executor = None
+        self.precision = precision
+        self.confidence_threshold = confidence_threshold
+        self.model_version = 0
         self.model = None
+        self.training_info = {}
         self.vocab = {}
         self.intents = []
+        self.tokenizer = Tokenizer(stem=stem)
+        # None featurizes by vocabulary index; a HashedFeaturizer fixes the input width
+        self.featurizer = HashedFeaturizer(feature_dim, feature_bigrams) if feature_dim else None
         self.model_path = Path("brain/models/aetherium_model.npy")
+        self.bundle_path = Path("brain/models/aetherium_model.bundle")
         self.vocab_path = Path("brain/data/vocab.json")
         self.intents_path = Path("brain/data/intents.json")
         self.windows_data_path = Path("brain/data/combined_windows_commands.json")
-        
-        self.load_or_initialize()
+        self.artifacts_manifest_path = Path("brain/data/artifacts_manifest.json")
+        self.fallback_rules_path = Path("brain/data/fallback_rules.json")
+        self.fallback = None
+        # Artifacts manifest of the loaded source data; names the data a bundle must be trained on
+        self.data_manifest = None
+        
+        # autoload=False gives an empty brain for callers that supply their own intents
+        if autoload:
+            self.load_or_initialize()
+    
+    @classmethod
+    def from_config(cls, config, autoload=True):
+        """Build a brain with the MODEL_CONFIG settings; the CLI and GUI must agree on them
+        
+        A brain whose feature or tokenizer settings differ from the saved bundle's
+        rejects the trained model and rewrites the shared vocab files.
+        """
+        return cls(
+            cache_size=config["cache_size"],
+            precision=config["precision"],
+            autoload=autoload,
+            confidence_threshold=config["confidence_threshold"],
+            feature_dim=config["feature_hashing_dim"],
+            feature_bigrams=config["feature_bigrams"],
+            stem=config["tokenizer_stem"]
+        )
+    
+    @property
+    def model(self):
+        return self._model
+    
+    @model.setter
+    def model(self, model):
+        # Swapping weights invalidates every cached prediction
+        self._model = model
+        self.invalidate_cache()
+    
+    def invalidate_cache(self):
+        """Bump the model version stamp and drop cached predictions"""
+        self.model_version += 1
+        self.prediction_cache.clear()
+        self.pattern_index = None
+    
+    def cache_stats(self):
+        """Return prediction cache counters"""
+        return dict(self.prediction_cache.stats(), model_version=self.model_version)
+    
+    def get_pattern_index(self):
+        """Map each normalized training pattern to its intent index"""
+        if self.pattern_index is None:
+            index = {}
+            ambiguous = set()
+            for intent_idx, intent in enumerate(self.intents):
+                for pattern in intent["patterns"]:
+                    key = self.tokenizer.normalize(pattern)
+                    if index.get(key, intent_idx) != intent_idx:
+                        ambiguous.add(key)
+                    index[key] = intent_idx
+            # Patterns claimed by several intents are left to the network
+            for key in ambiguous:
+                del index[key]
+            self.pattern_index = index
+        return self.pattern_index
+    
+    def index_stats(self):
+        """Return exact-match pattern index counters"""
+        return {
+            "size": len(self.get_pattern_index()),
+            "lookups": self.index_lookups,
+            "hits": self.index_hits,
+            "hit_rate": self.index_hits / self.index_lookups if self.index_lookups else 0.0
+        }
     
     def load_or_initialize(self):
         """Load Windows command data if available, otherwise initialize with basic data"""
@@ -41,39 +238,113 @@ class AetheriumBrain:
         # Priority 1: Load Windows command data if available
         if self.windows_data_path.exists():
             try:
-                with open(self.windows_data_path, 'r') as f:
-                    windows_data = json.load(f)
-                self.intents = windows_data["intents"]
-                print("✅ Loaded Windows command training data")
-                # Generate vocabulary from Windows data
-                self.generate_vocabulary_from_intents()
-                self.save_data()
+                source_hash = sha256_file(self.windows_data_path)
+                manifest = self.load_cached_artifacts(source_hash)
+                if manifest:
+                    print("✅ Loaded Windows command training data (unchanged)")
+                else:
+                    with open(self.windows_data_path, 'r') as f:
+                        windows_data = json.load(f)
+                    self.intents = windows_data["intents"]
+                    print("✅ Loaded Windows command training data")
+                    # Generate vocabulary from Windows data
+                    self.generate_vocabulary_from_intents(save=False)
+                    self.save_data()
+                    manifest = self.write_artifacts_manifest(source_hash)
+                # The trained bundle is not adopted here: command dispatch handles the
+                # rule-based tags, not the combined data's, so chat stays on the fallback.
+                # Commands that need the network call load_trained_model().
+                self.data_manifest = manifest
                 return
             except Exception as e:
                 print(f"❌ Error loading Windows data: {e}")
         
         # Priority 2: Load existing model if available
-        if self.model_path.exists():
+        if self.bundle_path.exists() or self.model_path.exists():
             self.load_model()
         else:
             # Priority 3: Initialize with basic data
             self.initialize_model()
     
-    def generate_vocabulary_from_intents(self):
+    def load_trained_model(self):
+        """Adopt the saved bundle if it was trained on the loaded source data; returns whether a model is loaded"""
+        if self.model is None and self.data_manifest and self.bundle_path.exists():
+            self.load_bundle(expected_data_hash=self.data_manifest["data_hash"],
+                             expected_features=self.feature_spec())
+        return self.model is not None
+    
+    def load_cached_artifacts(self, source_hash):
+        """Reuse vocab.json and intents.json if they were generated from this source data"""
+        try:
+            with open(self.artifacts_manifest_path, 'r') as f:
+                manifest = json.load(f)
+            # A different tokenizer would produce a different vocabulary
+            if manifest.get("source_sha256") != source_hash or manifest.get("tokenizer") != self.tokenizer.spec():
+                return None
+            
+            with open(self.vocab_path, 'rb') as f:
+                vocab_bytes = f.read()
+            with open(self.intents_path, 'rb') as f:
+                intents_bytes = f.read()
+        except (OSError, ValueError):
+            return None
+        
+        # Something else (e.g. generate-data) may have rewritten the artifacts
+        if (sha256_bytes(vocab_bytes) != manifest.get("vocab_sha256") or
+                sha256_bytes(intents_bytes) != manifest.get("intents_sha256")):
+            return None
+        
+        self.vocab = json.loads(vocab_bytes)
+        self.intents = json.loads(intents_bytes)["intents"]
+        self.invalidate_cache()
+        return manifest
+    
+    def write_artifacts_manifest(self, source_hash):
+        """Record which source data the vocab and intents files were generated from"""
+        manifest = {
+            "source": str(self.windows_data_path),
+            "source_sha256": source_hash,
+            "tokenizer": self.tokenizer.spec(),
+            "vocab_sha256": sha256_file(self.vocab_path),
+            "intents_sha256": sha256_file(self.intents_path),
+            "data_hash": sha256_json(self.intents)
+        }
+        with open(self.artifacts_manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+    
+    def refresh_artifacts_manifest(self):
+        """Re-record vocab.json and intents.json after they were rewritten for the same source data
+        
+        An incremental update appends new words, so its vocab.json is not the
+        sorted one startup would generate; recording it keeps startup from
+        regenerating a vocabulary that no longer matches the model.
+        """
+        try:
+            with open(self.artifacts_manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("data_hash") != sha256_json(self.intents):
+            return None
+        return self.write_artifacts_manifest(manifest["source_sha256"])
+    
+    def generate_vocabulary_from_intents(self, save=True):
         """Generate vocabulary from the loaded intents"""
         all_words = set()
         
         for intent in self.intents:
             for pattern in intent["patterns"]:
-                words = pattern.lower().split()
-                all_words.update(words)
+                all_words.update(self.tokenizer.tokenize(pattern))
         
         # Create vocabulary mapping
         self.vocab = {word: idx for idx, word in enumerate(sorted(all_words))}
+        self.invalidate_cache()
         
         # Save vocabulary
-        with open(self.vocab_path, 'w') as f:
-            json.dump(self.vocab, f, indent=2)
+        if save:
+            with open(self.vocab_path, 'w') as f:
+                json.dump(self.vocab, f, indent=2)
         
         print(f"✅ Generated vocabulary with {len(self.vocab)} words from Windows data")
     
@@ -154,109 +425,137 @@ class AetheriumBrain:
         self.save_data()
         print("✅ Initialized with basic Windows command data")
     
-    def text_to_vector(self, text):
-        """Convert text to numerical vector using current vocabulary"""
-        words = text.lower().split()
-        vector = np.zeros(len(self.vocab))
+    def feature_spec(self):
+        spec = self.featurizer.spec() if self.featurizer else {"type": "vocab"}
+        return dict(spec, tokenizer=self.tokenizer.spec())
+    
+    def input_size(self):
+        """Width of the feature vectors the model consumes"""
+        return self.featurizer.dimension if self.featurizer else len(self.vocab)
+    
+    def text_to_indices(self, text):
+        """Convert text to sparse (indices, counts) using current vocabulary"""
+        words = self.tokenizer.tokenize(text)
+        if self.featurizer:
+            return self.featurizer.tokens_to_indices(words)
         
+        counts = {}
         for word in words:
-            if word in self.vocab:
-                vector[self.vocab[word]] += 1
+            idx = self.vocab.get(word)
+            if idx is not None:
+                counts[idx] = counts.get(idx, 0) + 1
+        
+        return list(counts.keys()), list(counts.values())
+    
+    def texts_to_matrix(self, texts):
+        """Featurize a batch of texts into a sparse CSR matrix"""
+        return SparseMatrix.from_rows((self.text_to_indices(text) for text in texts), self.input_size())
+    
+    def text_to_vector(self, text):
+        """Convert text to numerical vector using current vocabulary"""
+        vector = np.zeros(self.input_size())
+        indices, counts = self.text_to_indices(text)
+        np.add.at(vector, indices, counts)
         
         return vector
     
     def predict_intent(self, text):
         """Predict the intent of user input with Windows command focus"""
-        vector = self.text_to_vector(text)
-        
-        # If model is trained, use it
-        if self.model:
-            prediction = self.model.predict(vector.reshape(1, -1))
-            if np.max(prediction) > 0.3:  # Lower threshold for better matching
-                intent_idx = np.argmax(prediction)
-                return {
-                    "tag": self.intents[intent_idx]["tag"], 
-                    "response": np.random.choice(self.intents[intent_idx]["responses"])
-                }
-        
-        # Fallback to rule-based matching for Windows commands
-        return self.windows_rule_based_fallback(text)
+        return self.predict_intents([text])[0]
     
-    def windows_rule_based_fallback(self, text):
-        """Rule-based intent matching optimized for Windows commands"""
-        text_lower = text.lower()
-        
-        # Windows command specific matching
-        if any(word in text_lower for word in ['hello', 'hi', 'hey', 'greetings']):
-            return {"tag": "greeting", "response": "Hello! I can help with Windows commands."}
-        
-        elif any(word in text_lower for word in ['list', 'show', 'display', 'dir', 'ls', 'files']):
-            return {"tag": "list_files", "response": "I'll list the files for you."}
-        
-        elif any(word in text_lower for word in ['create', 'make', 'new', 'touch', 'write']):
-            return {"tag": "create_file", "response": "I can help create a file or folder."}
-        
-        elif any(word in text_lower for word in ['read', 'open', 'view', 'cat', 'type', 'show content']):
-            return {"tag": "read_file", "response": "I'll read the file contents."}
-        
-        elif any(word in text_lower for word in ['delete', 'remove', 'rm', 'del', 'erase']):
-            return {"tag": "delete_file", "response": "I can help delete files."}
-        
-        elif any(word in text_lower for word in ['system', 'info', 'status', 'health', 'specs', 'computer']):
-            return {"tag": "system_info", "response": "Here's system information."}
-        
-        elif any(word in text_lower for word in ['process', 'task', 'running', 'programs', 'tasklist']):
-            return {"tag": "process_list", "response": "Showing running processes."}
-        
-        elif any(word in text_lower for word in ['network', 'ip', 'connection', 'internet', 'ping', 'ipconfig']):
-            return {"tag": "network_info", "response": "Executing network command."}
-        
-        elif any(word in text_lower for word in ['disk', 'storage', 'space', 'usage', 'capacity', 'df']):
-            return {"tag": "disk_usage", "response": "Checking disk usage."}
-        
-        # ADD THESE NEW INTENTS FOR ADVANCED COMMANDS:
-        elif any(word in text_lower for word in ['uptime', 'boot time', 'system uptime', 'how long running']):
-            return {"tag": "system_uptime", "response": "Checking system uptime..."}
-        
-        elif any(word in text_lower for word in ['users', 'logged in', 'who is online', 'current users']):
-            return {"tag": "users_online", "response": "Showing logged in users..."}
-        
-        elif any(word in text_lower for word in ['environment', 'env', 'variables', 'path', 'home']):
-            return {"tag": "environment_vars", "response": "Showing environment variables..."}
-        
-        elif any(word in text_lower for word in ['services', 'running services', 'windows services', 'service status']):
-            return {"tag": "running_services", "response": "Checking running services..."}
-        
-        elif any(word in text_lower for word in ['run', 'execute', 'command', 'cmd', 'windows']):
-            # Extract the actual command to run
-            words = text_lower.split()
-            potential_commands = [word for word in words if word in [
-                'dir', 'copy', 'move', 'del', 'mkdir', 'systeminfo', 'tasklist', 
-                'ipconfig', 'ping', 'netstat', 'chkdsk', 'format', 'uptime'
-            ]]
+    def predict_intents(self, texts):
+        """Predict intents for a batch of inputs with a single forward pass"""
+        version = self.model_version
+        # Inputs differing only in case, spacing or punctuation share a cache entry
+        keys = [(self.tokenizer.normalize(text), version) for text in texts]
+        decisions = [self.prediction_cache.get(key) for key in keys]
+        
+        # Only inputs missing from the cache are featurized and scored
+        pending = {}
+        for key, decision in zip(keys, decisions):
+            if decision is None:
+                pending.setdefault(key[0], None)
+        
+        model = self.model
+        if pending and model:
+            # Known training patterns resolve from the index without the network
+            index = self.get_pattern_index()
+            hits = 0
+            for text in pending:
+                if text in index:
+                    hits += 1
+                    pending[text] = ("intent", index[text])
+            with self.stats_lock:
+                self.index_lookups += len(pending)
+                self.index_hits += hits
+        
+        texts_to_score = [text for text, decision in pending.items() if decision is None]
+        if texts_to_score:
+            predictions = None
+            if model:
+                predictions = model.predict(self.texts_to_matrix(texts_to_score))
             
-            if potential_commands:
-                return {"tag": "command_execution", "response": f"Executing {potential_commands[0]} command..."}
+            for row, text in enumerate(texts_to_score):
+                if predictions is not None and np.max(predictions[row]) > self.confidence_threshold:
+                    pending[text] = ("intent", int(np.argmax(predictions[row])))
+                else:
+                    # Fallback to rule-based matching for Windows commands
+                    pending[text] = ("fallback", self.windows_rule_based_fallback(text))
+                self.prediction_cache.put((text, version), pending[text])
+        
+        results = []
+        for key, decision in zip(keys, decisions):
+            kind, value = decision if decision is not None else pending[key[0]]
+            if kind == "intent":
+                results.append({
+                    "tag": self.intents[value]["tag"], 
+                    "response": np.random.choice(self.intents[value]["responses"])
+                })
             else:
-                return {"tag": "command_execution", "response": "I'll execute that command."}
+                results.append(dict(value))
         
-        elif any(word in text_lower for word in ['help', 'assist', 'support', 'how to']):
-            return {"tag": "help", "response": "I can help with Windows commands like dir, copy, systeminfo, tasklist, ipconfig, uptime, etc."}
-        
-        else:
-            return {"tag": "unknown", "response": "I'm not sure about that Windows command. Try: dir, copy, systeminfo, tasklist, ipconfig, uptime"}
+        return results
+    
+    def predict_concurrent(self, texts, workers=None, chunk_size=256):
+        """Classify texts on a shared worker pool, returning results in input order
+        
+        Inference is reentrant: the network keeps no per-call state and the
+        cache and counters are lock-protected, so this and predict_intent can
+        be called from any number of threads at once. numpy releases the GIL
+        inside the matrix products, so chunks score in parallel. The pool is
+        created on first use with `workers` threads and reused until close().
+        """
+        texts = list(texts)
+        if self.executor is None:
+            with self.stats_lock:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="aetherium")
+        
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        results = []
+        for chunk_results in self.executor.map(self.predict_intents, chunks):
+            results.extend(chunk_results)
+        return results
+    
+    def close(self):
+        """Shut down the worker pool used by predict_concurrent"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
     
+    def windows_rule_based_fallback(self, text):
+        """Rule-based intent matching optimized for Windows commands"""
+        # Rules are compiled once into a single keyword automaton
+        if self.fallback is None:
+            self.fallback = RuleBasedFallback.load(self.fallback_rules_path)
+        
+        return self.fallback.match(text)
     
-    def save_data(self):
+    def save_data(self, bundle=True):
         """Save model and data"""
-        # Save model weights if model exists
-        if self.model:
-            np.save(self.model_path, {
-                'weights1': self.model.weights1,
-                'weights2': self.model.weights2,
-                'bias1': self.model.bias1,
-                'bias2': self.model.bias2
-            })
+        # Save weights, vocab and intents together as a single bundle
+        if bundle and self.model:
+            self.export_bundle(self.bundle_path)
         
         # Save vocabulary
         with open(self.vocab_path, 'w') as f:
@@ -266,25 +565,63 @@ class AetheriumBrain:
         with open(self.intents_path, 'w') as f:
             json.dump({"intents": self.intents}, f, indent=2)
     
+    def load_bundle(self, path=None, expected_data_hash=None, expected_features=None):
+        """Memory-map a model bundle and adopt its weights, vocab, intents and featurizer"""
+        arrays, meta = load_bundle(path or self.bundle_path)
+        if expected_data_hash and meta.get("data_hash") != expected_data_hash:
+            print("⚠️  Saved model was trained on different data, retrain with: python main.py train")
+            return False
+        features = meta.get("features", {"type": "vocab"})
+        if expected_features and features != expected_features:
+            print("⚠️  Saved model uses different feature settings, retrain with: python main.py train")
+            return False
+        
+        model = bundle_network(arrays, meta)
+        if model.precision != self.precision:
+            model = model.to_precision(self.precision)
+        
+        self.vocab = meta["vocab"]
+        self.intents = meta["intents"]
+        self.featurizer = make_featurizer(features)
+        self.tokenizer = make_tokenizer(features.get("tokenizer"))
+        self.training_info = meta.get("training", {})
+        self.model = model
+        if "pattern_index" in meta:
+            self.pattern_index = meta["pattern_index"]
+        return True
+    
+    def stored_model(self, path=None):
+        """The bundle's network at the precision it was saved with, not the configured one"""
+        arrays, meta = load_bundle(path or self.bundle_path)
+        return bundle_network(arrays, meta)
+    
+    def export_bundle(self, path, precision=None):
+        """Write the current model to a bundle, optionally converted to another precision"""
+        model = self.model.to_precision(precision) if precision else self.model
+        save_bundle(path, model.weight_arrays(), {
+            "vocab": self.vocab,
+            "intents": self.intents,
+            "data_hash": sha256_json(self.intents),
+            "precision": model.precision,
+            "output": model.output,
+            "features": self.feature_spec(),
+            "pattern_index": self.get_pattern_index(),
+            "training": self.training_info
+        })
+    
+    def convert_legacy_model(self):
+        """Convert the pickled .npy model and JSON files into a model bundle"""
+        convert_legacy_model(self.model_path, self.vocab_path, self.intents_path, self.bundle_path)
+        print(f"✅ Converted legacy model to {self.bundle_path}")
+    
     def load_model(self):
         """Load saved model and data"""
         try:
-            # Load model weights
-            data = np.load(self.model_path, allow_pickle=True).item()
-            self.model = NeuralNetwork(len(self.vocab), 8, len(self.intents))
-            self.model.weights1 = data['weights1']
-            self.model.weights2 = data['weights2']
-            self.model.bias1 = data['bias1']
-            self.model.bias2 = data['bias2']
+            # One-time migration from the pickled .npy + JSON layout
+            if not self.bundle_path.exists():
+                self.convert_legacy_model()
             
-            # Load vocabulary
-            with open(self.vocab_path, 'r') as f:
-                self.vocab = json.load(f)
-            
-            # Load intents
-            with open(self.intents_path, 'r') as f:
-                self.intents = json.load(f)["intents"]
-                
+            self.load_bundle()
             print("✅ Loaded trained model and data")
                 
         except Exception as e:
@@ -0,0 +1,86 @@
+import numpy as np
+
+class SGD:
+    """Plain gradient descent, the trainer's original update rule"""
+
+    def __init__(self, learning_rate=0.1):
+        self.learning_rate = learning_rate
+
+    def step(self, params, grads):
+        for name, grad in grads.items():
+            params[name] -= self.learning_rate * grad
+
+    def state_arrays(self):
+        return {}
+
+    def load_state_arrays(self, arrays):
+        pass
+
+class Momentum(SGD):
+    """Gradient descent with classical momentum"""
+
+    def __init__(self, learning_rate=0.1, momentum=0.9):
+        super().__init__(learning_rate)
+        self.momentum = momentum
+        self.velocity = {}
+
+    def step(self, params, grads):
+        for name, grad in grads.items():
+            velocity = self.velocity.setdefault(name, np.zeros_like(grad))
+            velocity *= self.momentum
+            velocity -= self.learning_rate * grad
+            params[name] += velocity
+
+    def state_arrays(self):
+        return {f"velocity.{name}": value for name, value in self.velocity.items()}
+
+    def load_state_arrays(self, arrays):
+        self.velocity = {name.split(".", 1)[1]: np.array(value) for name, value in arrays.items()
+                         if name.startswith("velocity.")}
+
+class Adam(SGD):
+    """Adam with bias-corrected first and second moment estimates"""
+
+    def __init__(self, learning_rate=0.01, beta1=0.9, beta2=0.999, epsilon=1e-8):
+        super().__init__(learning_rate)
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+        self.steps = 0
+        self.first = {}
+        self.second = {}
+
+    def step(self, params, grads):
+        self.steps += 1
+        correction1 = 1 - self.beta1 ** self.steps
+        correction2 = 1 - self.beta2 ** self.steps
+        for name, grad in grads.items():
+            first = self.first.setdefault(name, np.zeros_like(grad))
+            second = self.second.setdefault(name, np.zeros_like(grad))
+            first *= self.beta1
+            first += (1 - self.beta1) * grad
+            second *= self.beta2
+            second += (1 - self.beta2) * np.square(grad)
+            params[name] -= self.learning_rate * (first / correction1) / (np.sqrt(second / correction2) + self.epsilon)
+
+    def state_arrays(self):
+        arrays = {"steps": np.array([self.steps])}
+        arrays.update({f"first.{name}": value for name, value in self.first.items()})
+        arrays.update({f"second.{name}": value for name, value in self.second.items()})
+        return arrays
+
+    def load_state_arrays(self, arrays):
+        self.steps = int(arrays["steps"][0]) if "steps" in arrays else 0
+        self.first = {name.split(".", 1)[1]: np.array(value) for name, value in arrays.items() if name.startswith("first.")}
+        self.second = {name.split(".", 1)[1]: np.array(value) for name, value in arrays.items() if name.startswith("second.")}
+
+OPTIMIZERS = {
+    "sgd": SGD,
+    "momentum": Momentum,
+    "adam": Adam
+}
+
+def make_optimizer(name, learning_rate):
+    if name not in OPTIMIZERS:
+        raise ValueError(f"Unknown optimizer '{name}', expected one of {sorted(OPTIMIZERS)}")
+    return OPTIMIZERS[name](learning_rate)
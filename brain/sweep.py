@@ -0,0 +1,99 @@
+import itertools
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from .bundle import load_bundle
+from .features import SparseMatrix
+from .model import NeuralNetwork
+from .optim import make_optimizer
+from .trainer import ModelTrainer
+
+def train_config(job):
+    """Train one hyperparameter combination; runs inside a worker process"""
+    # Every worker memory-maps the same feature cache file, so the
+    # training set lives once in the OS page cache instead of per process
+    arrays, meta = load_bundle(job["cache_path"])
+    X = SparseMatrix(arrays['data'], arrays['indices'], arrays['indptr'], meta["shape"])
+    labels = np.asarray(arrays['labels'])
+    train_rows, val_rows = np.asarray(job["train_rows"]), np.asarray(job["val_rows"])
+    # Batches are taken from the mapped matrix as needed; only the small
+    # validation split is copied
+    eval_rows = val_rows if len(val_rows) else train_rows
+    X_val, labels_val = X.take(eval_rows), labels[eval_rows]
+
+    rng = np.random.default_rng(job["seed"])
+    model = NeuralNetwork(X.shape[1], job["hidden_size"], job["output_size"], job["output"], rng)
+    optimizer = make_optimizer(job["optimizer"], job["learning_rate"])
+    trainer = ModelTrainer(None)
+
+    start = time.perf_counter()
+    for _ in range(job["epochs"]):
+        for X_batch, labels_batch in trainer.iterate_batches(X, labels, job["batch_size"], True, rng, train_rows):
+            trainer.train_step(model, X_batch, labels_batch, optimizer)
+    train_seconds = time.perf_counter() - start
+
+    val_loss, val_accuracy = trainer.evaluate(model, X_val, labels_val)
+
+    start = time.perf_counter()
+    for row in range(min(len(labels_val), 200)):
+        model.predict(X_val.take([row]))
+    latency_ms = (time.perf_counter() - start) / max(1, min(len(labels_val), 200)) * 1000
+
+    return {
+        "hidden_size": job["hidden_size"],
+        "learning_rate": job["learning_rate"],
+        "epochs": job["epochs"],
+        "batch_size": job["batch_size"],
+        "optimizer": job["optimizer"],
+        "output": job["output"],
+        "val_accuracy": val_accuracy,
+        "val_loss": val_loss,
+        "train_seconds": train_seconds,
+        "latency_ms": latency_ms,
+        "weights": model.weight_arrays()
+    }
+
+def run_sweep(trainer, hidden_sizes, learning_rates, epoch_budgets, batch_size=None,
+              validation_split=0.1, seed=0, workers=None, optimizer="sgd", output="sigmoid"):
+    """Train every grid combination in a process pool and return a sorted leaderboard"""
+    # Featurize once; workers read the cached bundle from disk
+    X, labels = trainer.load_training_matrix()
+    train_rows, val_rows = trainer.split_validation(labels, validation_split, np.random.default_rng(seed))
+
+    jobs = [{
+        "cache_path": str(trainer.feature_cache_path()),
+        "train_rows": train_rows.tolist(),
+        "val_rows": val_rows.tolist(),
+        "output_size": len(trainer.brain.intents),
+        "hidden_size": hidden_size,
+        "learning_rate": learning_rate,
+        "epochs": epochs,
+        "batch_size": batch_size,
+        "optimizer": optimizer,
+        "output": output,
+        "seed": seed
+    } for hidden_size, learning_rate, epochs in itertools.product(hidden_sizes, learning_rates, epoch_budgets)]
+
+    workers = workers or os.cpu_count()
+    print(f"🔬 Training {len(jobs)} configurations on {min(workers, len(jobs))} workers...")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(train_config, jobs))
+
+    results.sort(key=lambda r: (-r["val_accuracy"], r["val_loss"], r["train_seconds"]))
+    return results
+
+def apply_result(brain, result):
+    """Make a sweep result the active model and save it"""
+    weights = result["weights"]
+    brain.model = NeuralNetwork.from_weights(weights['weights1'], weights['weights2'], weights['bias1'], weights['bias2'],
+                                             output=result["output"])
+    brain.training_info = {key: result[key] for key in ("hidden_size", "learning_rate", "epochs", "batch_size",
+                                                        "optimizer", "output")}
+    brain.save_data()
+
+def print_leaderboard(results, limit=10):
+    print(f"{'#':>3} {'Hidden':>6} {'LR':>7} {'Epochs':>6} {'Val acc':>8} {'Val loss':>9} {'Train s':>8} {'Infer ms':>9}")
+    for rank, r in enumerate(results[:limit], 1):
+        print(f"{rank:>3} {r['hidden_size']:>6} {r['learning_rate']:>7g} {r['epochs']:>6} "
+              f"{r['val_accuracy']:>7.2%} {r['val_loss']:>9.4f} {r['train_seconds']:>8.2f} {r['latency_ms']:>9.3f}")
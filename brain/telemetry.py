@@ -0,0 +1,129 @@
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+from pathlib import Path
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far, or None if it cannot be read"""
+    try:
+        import resource
+    except ImportError:
+        # Windows has no resource module; psutil reports the peak working set
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+class TrainingTelemetry:
+    """Per-epoch training records written as JSON Lines and passed to an optional callback
+
+    The file starts with a "run" record describing the data (samples, vocab,
+    intents, non-zeros) and settings, so a slower run can be attributed to
+    data growth or to code by comparing the normalised per-sample timings.
+    """
+
+    def __init__(self, path=None, callback=None, trace_memory=False):
+        self.path = Path(path) if path else None
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.file = None
+        self.run = {}
+        self.epochs = []
+        self.started = None
+
+    def start(self, **run):
+        self.started = time.perf_counter()
+        self.run = dict(run, python=platform.python_version(), numpy=np.__version__)
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.file = open(self.path, 'w')
+        self.write(dict(self.run, type="run"))
+
+    def write(self, record):
+        if self.file:
+            # One flushed line per record so a preempted run still leaves usable telemetry
+            self.file.write(json.dumps(record) + "\n")
+            self.file.flush()
+
+    def record_epoch(self, epoch, train_seconds, samples, loss, eval_seconds=0.0, val_loss=None, val_accuracy=None):
+        record = {
+            "type": "epoch",
+            "epoch": epoch,
+            "train_seconds": train_seconds,
+            "eval_seconds": eval_seconds,
+            "samples_per_second": samples / train_seconds if train_seconds else 0.0,
+            "loss": loss,
+            "val_loss": val_loss,
+            "val_accuracy": val_accuracy,
+            "peak_rss_bytes": peak_rss_bytes()
+        }
+        if tracemalloc.is_tracing():
+            record["peak_traced_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+
+        self.epochs.append(record)
+        self.write(record)
+        if self.callback:
+            self.callback(record)
+        return record
+
+    def summary(self):
+        train_seconds = np.array([r["train_seconds"] for r in self.epochs]) if self.epochs else np.zeros(1)
+        accuracies = [r["val_accuracy"] for r in self.epochs if r["val_accuracy"] is not None]
+        traced = [r["peak_traced_bytes"] for r in self.epochs if "peak_traced_bytes" in r]
+        samples = self.run.get("train_samples", 0)
+        return {
+            "epochs": len(self.epochs),
+            "wall_seconds": time.perf_counter() - self.started if self.started else 0.0,
+            "train_seconds": float(train_seconds.sum()),
+            "epoch_p50_ms": float(np.percentile(train_seconds, 50) * 1000),
+            "epoch_p95_ms": float(np.percentile(train_seconds, 95) * 1000),
+            # Per-sample cost separates code speed from data size
+            "us_per_sample": float(np.median(train_seconds) / samples * 1e6) if samples else 0.0,
+            "samples_per_second": float(samples * len(self.epochs) / train_seconds.sum()) if train_seconds.sum() else 0.0,
+            "final_loss": self.epochs[-1]["loss"] if self.epochs else None,
+            "best_val_accuracy": max(accuracies) if accuracies else None,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "peak_traced_bytes": max(traced) if traced else None,
+            "train_samples": samples,
+            "vocab_size": self.run.get("vocab_size", 0),
+            "intents": self.run.get("intents", 0),
+            "nnz": self.run.get("nnz", 0)
+        }
+
+    def close(self):
+        summary = self.summary()
+        self.write(dict(summary, type="summary"))
+        if self.file:
+            self.file.close()
+            self.file = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return summary
+
+def print_summary(summary):
+    rows = [
+        ("Epochs", f"{summary['epochs']}"),
+        ("Wall time", f"{summary['wall_seconds']:.2f}s ({summary['train_seconds']:.2f}s in updates)"),
+        ("Epoch time", f"p50 {summary['epoch_p50_ms']:.2f}ms, p95 {summary['epoch_p95_ms']:.2f}ms"),
+        ("Throughput", f"{summary['samples_per_second']:,.0f} samples/s ({summary['us_per_sample']:.2f}µs/sample)"),
+        ("Final loss", f"{summary['final_loss']:.4f}" if summary['final_loss'] is not None else "-"),
+        ("Best val acc", f"{summary['best_val_accuracy']:.2%}" if summary['best_val_accuracy'] is not None else "-"),
+        ("Peak RSS", f"{summary['peak_rss_bytes'] / 2**20:.1f} MB" if summary['peak_rss_bytes'] else "-"),
+        ("Peak traced", f"{summary['peak_traced_bytes'] / 2**20:.1f} MB" if summary['peak_traced_bytes'] else "-"),
+        ("Data", f"{summary['train_samples']} samples, {summary['vocab_size']} words, "
+                 f"{summary['intents']} intents, {summary['nnz']} non-zeros")
+    ]
+    print("📊 Training summary")
+    for label, value in rows:
+        print(f"  {label:14} {value}")
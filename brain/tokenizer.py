@@ -0,0 +1,71 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+# Bump whenever tokenization rules change; vocabularies and models built with
+# another version have to be regenerated
+TOKENIZER_VERSION = 1
+
+# Words may keep inner dots, apostrophes and hyphens ("file.txt", "what's"),
+# leading and trailing punctuation is dropped ("files?" -> "files")
+TOKEN_PATTERN = re.compile(r"\w+(?:[.'-]\w+)*")
+
+@lru_cache(maxsize=65536)
+def stem(word):
+    """Light suffix stripping: possessives and plurals first, then -ing/-ed"""
+    if word.endswith("'s"):
+        word = word[:-2]
+    elif len(word) > 4 and word.endswith("ies"):
+        word = word[:-3] + "y"
+    elif word.endswith("sses"):
+        word = word[:-2]
+    elif len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+
+    for suffix in ("ing", "ed"):
+        base = word[:-len(suffix)]
+        if word.endswith(suffix) and len(base) >= 3 and any(c in "aeiouy" for c in base) and not base.endswith("e"):
+            # running -> run, listed -> list
+            if len(base) > 3 and base[-1] == base[-2] and base[-1] not in "lsz":
+                base = base[:-1]
+            return base
+    return word
+
+class Tokenizer:
+    """The one place text becomes tokens: generator, vocabulary, featurizers and fallback all use it"""
+
+    def __init__(self, stem=False, strip_punctuation=True):
+        self.stem = stem
+        self.strip_punctuation = strip_punctuation
+
+    def spec(self):
+        return {"version": TOKENIZER_VERSION, "stem": self.stem, "strip_punctuation": self.strip_punctuation}
+
+    def words(self, text):
+        """Unicode-normalized, case-folded words before stemming"""
+        # NFKC only changes non-ASCII text, so skip it for the common case
+        text = text.casefold() if text.isascii() else unicodedata.normalize("NFKC", text).casefold()
+        return TOKEN_PATTERN.findall(text) if self.strip_punctuation else text.split()
+
+    def normalize(self, text):
+        """Canonical form of a text; inputs that differ only in case, spacing or punctuation share it"""
+        return " ".join(self.words(text))
+
+    def tokenize(self, text):
+        words = self.words(text)
+        return [stem(word) for word in words] if self.stem else words
+
+def legacy_tokenizer():
+    """The lower().split() tokenization that built vocabularies before specs were recorded"""
+    return Tokenizer(strip_punctuation=False)
+
+def make_tokenizer(spec):
+    """Tokenizer for a stored spec; refuses specs from other tokenizer versions
+
+    Bundles without a spec predate the shared tokenizer and get the legacy one.
+    """
+    if not spec:
+        return legacy_tokenizer()
+    if spec.get("version") != TOKENIZER_VERSION:
+        raise ValueError(f"Tokenizer version {spec.get('version')} does not match {TOKENIZER_VERSION}")
+    return Tokenizer(spec.get("stem", False), spec.get("strip_punctuation", True))
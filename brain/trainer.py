@@ -1,12 +1,41 @@
 import numpy as np
 import json
+import os
+import shutil
+import time
 from pathlib import Path
-from .model import NeuralNetwork
+from .model import NeuralNetwork, PRECISIONS
+from .optim import make_optimizer
+from .telemetry import TrainingTelemetry
+from .features import SparseMatrix
+from .bundle import save_bundle, load_bundle, read_bundle_header
+from .hashing import sha256_json, sha256_file
+
+# Modules whose code determines the trained weights; part of the build cache key
+TRAINING_SOURCES = ("trainer.py", "model.py", "optim.py", "features.py", "bundle.py")
+
+def prune_cache(directory, current, keep):
+    """Delete all but the `keep` most recently written or used bundles in a cache directory
+    
+    `current`, the entry just written, always survives even if mtimes tie.
+    """
+    current = Path(current)
+    entries = sorted(Path(directory).glob("*.bundle"),
+                     key=lambda path: (path == current, path.stat().st_mtime_ns), reverse=True)
+    for stale in entries[keep:]:
+        try:
+            stale.unlink(missing_ok=True)
+        except OSError:
+            # Still memory-mapped somewhere (Windows); the next prune retries
+            pass
 
 class ModelTrainer:
     def __init__(self, brain):
         self.brain = brain
         self.training_data_path = Path("brain/data/training_data.json")
+        self.feature_cache_dir = Path("brain/data/feature_cache")
+        self.checkpoint_path = Path("brain/models/checkpoints/train_latest.bundle")
+        self.build_cache_dir = Path("brain/models/build_cache")
     
     def generate_training_data(self):
         training_data = []
@@ -25,44 +54,537 @@ class ModelTrainer:
         
         return training_data
     
-    def train_model(self, epochs=1000, learning_rate=0.1):
+    def generate_training_matrix(self):
+        """Featurize every pattern into a sparse matrix plus intent labels"""
+        patterns = []
+        labels = []
+        for intent_idx, intent in enumerate(self.brain.intents):
+            patterns.extend(intent['patterns'])
+            labels.extend([intent_idx] * len(intent['patterns']))
+        
+        return self.brain.texts_to_matrix(patterns), np.array(labels, dtype=np.int64)
+    
+    def feature_cache_key(self):
+        """Hash of everything the featurized training set depends on"""
+        return sha256_json({
+            "patterns": [[intent['tag'], intent['patterns']] for intent in self.brain.intents],
+            "vocab": self.brain.vocab,
+            "features": self.brain.feature_spec()
+        })
+    
+    def feature_cache_path(self, key=None):
+        return self.feature_cache_dir / f"{(key or self.feature_cache_key())[:32]}.bundle"
+    
+    def load_training_matrix(self, keep=5):
+        """Reuse the cached sparse training set for these intents and vocab, or build it
+        
+        A new entry prunes the cache to the `keep` most recently used ones.
+        """
+        key = self.feature_cache_key()
+        cache_path = self.feature_cache_path(key)
+        
+        if cache_path.exists():
+            try:
+                arrays, meta = load_bundle(cache_path)
+                if meta.get("key") == key:
+                    X = SparseMatrix(arrays['data'], arrays['indices'], arrays['indptr'], meta["shape"])
+                    # Mark it recently used so pruning keeps it
+                    os.utime(cache_path)
+                    return X, arrays['labels']
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Ignoring unreadable feature cache {cache_path}: {e}")
+        
+        X, labels = self.generate_training_matrix()
+        save_bundle(cache_path, {
+            'data': X.data,
+            'indices': X.indices,
+            'indptr': X.indptr,
+            'labels': labels
+        }, {"key": key, "shape": list(X.shape)})
+        prune_cache(self.feature_cache_dir, cache_path, keep)
+        return X, labels
+    
+    def export_training_data(self):
+        """Debug export of every dense input/target vector as JSON"""
+        self.training_data_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.training_data_path, 'w') as f:
+            json.dump(self.generate_training_data(), f, indent=2)
+        print(f"💾 Exported dense training data to {self.training_data_path}")
+    
+    def train_step(self, model, X, labels, optimizer):
+        """One backpropagation update on a batch; returns the summed loss"""
+        y = np.zeros((len(labels), model.weights2.shape[1]))
+        y[np.arange(len(labels)), labels] = 1
+        
+        hidden = model.sigmoid(X.dot(model.weights1) + model.bias1)
+        logits = np.dot(hidden, model.weights2) + model.bias2
+        
+        if model.output == "softmax":
+            output = model.softmax(logits)
+            # Cross-entropy through softmax: the logit gradient is simply y - p
+            delta_output = y - output
+            loss = -np.sum(np.log(output[np.arange(len(labels)), labels] + 1e-12))
+        else:
+            output = model.sigmoid(logits)
+            error = y - output
+            delta_output = error * output * (1 - output)
+            loss = np.sum(np.square(error))
+        
+        error_hidden = delta_output.dot(model.weights2.T)
+        delta_hidden = error_hidden * hidden * (1 - hidden)
+        
+        # Deltas point downhill; the optimizer expects loss gradients
+        optimizer.step(model.weight_arrays(), {
+            'weights2': -hidden.T.dot(delta_output),
+            'bias2': -np.sum(delta_output, axis=0, keepdims=True),
+            'weights1': -X.transpose_dot(delta_hidden),
+            'bias1': -np.sum(delta_hidden, axis=0, keepdims=True)
+        })
+        
+        return float(loss)
+    
+    def iterate_batches(self, X, labels, batch_size, shuffle, rng, rows=None):
+        """Yield (X_batch, labels_batch) row slices of the sparse corpus
+        
+        `rows` limits the epoch to a subset of X, such as a training split,
+        without copying the subset out first: only one batch is taken at a time.
+        """
+        if rows is None:
+            if not batch_size or batch_size >= len(labels):
+                # Full batch: the summed gradient does not depend on row order
+                yield X, labels
+                return
+            rows = np.arange(len(labels))
+        elif not batch_size or batch_size >= len(rows):
+            yield X.take(rows), labels[rows]
+            return
+        
+        order = rows[rng.permutation(len(rows))] if shuffle else rows
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            yield X.take(batch), labels[batch]
+    
+    def split_validation(self, labels, fraction, rng):
+        """Stratified split: hold out `fraction` of each intent's patterns, keeping at least one for training"""
+        train_rows = []
+        val_rows = []
+        for intent_idx in np.unique(labels):
+            rows = rng.permutation(np.flatnonzero(labels == intent_idx))
+            held_out = min(int(len(rows) * fraction), len(rows) - 1)
+            val_rows.extend(rows[:held_out])
+            train_rows.extend(rows[held_out:])
+        return np.sort(np.array(train_rows, dtype=np.int64)), np.sort(np.array(val_rows, dtype=np.int64))
+    
+    def evaluate(self, model, X, labels):
+        """Loss (squared error, or cross-entropy for softmax) and accuracy on a labelled set"""
+        output = model.predict(X)
+        accuracy = float(np.mean(np.argmax(output, axis=1) == labels))
+        if model.output == "softmax":
+            return float(-np.mean(np.log(output[np.arange(len(labels)), labels] + 1e-12))), accuracy
+        y = np.zeros_like(output)
+        y[np.arange(len(labels)), labels] = 1
+        return float(np.mean(np.square(y - output))), accuracy
+    
+    def build_cache_key(self, settings):
+        """Hash of every training input: intents, vocab, training code and hyperparameters"""
+        source_dir = Path(__file__).parent
+        return sha256_json({
+            "intents": self.brain.intents,
+            "vocab": self.brain.vocab,
+            "features": self.brain.feature_spec(),
+            "code": {name: sha256_file(source_dir / name) for name in TRAINING_SOURCES},
+            "settings": settings
+        })
+    
+    def build_cache_path(self, key):
+        return self.build_cache_dir / f"{key[:32]}.bundle"
+    
+    def restore_build(self, key):
+        """Make a cached model for this key the active one; returns its training info or None"""
+        cache_path = self.build_cache_path(key)
+        if not cache_path.exists():
+            return None
+        try:
+            header, _ = read_bundle_header(cache_path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable build cache entry {cache_path}: {e}")
+            return None
+        if header["meta"].get("training", {}).get("build_key") != key:
+            return None
+        
+        # Copy the exact bytes that training produced, then adopt them. The loaded
+        # model may map the old bundle, and Windows cannot replace a mapped file
+        self.brain.model = None
+        bundle_path = Path(self.brain.bundle_path)
+        bundle_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = bundle_path.with_name(bundle_path.name + ".tmp")
+        shutil.copyfile(cache_path, tmp_path)
+        os.replace(tmp_path, bundle_path)
+        # Mark it recently used so pruning keeps it
+        os.utime(cache_path)
+        self.brain.load_bundle()
+        self.brain.save_data(bundle=False)
+        return self.brain.training_info
+    
+    def store_build(self, key, keep=5):
+        """Copy the freshly saved model bundle into the build cache, keeping the newest entries"""
+        cache_path = self.build_cache_path(key)
+        self.build_cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        shutil.copyfile(self.brain.bundle_path, tmp_path)
+        os.replace(tmp_path, cache_path)
+        prune_cache(self.build_cache_dir, cache_path, keep)
+    
+    def checkpoint_config(self, **config):
+        """Settings a checkpoint must share with the current run to be resumable"""
+        return dict(config, data_hash=self.feature_cache_key())
+    
+    def save_checkpoint(self, model, optimizer, rng, state, best_weights, split, config):
+        """Atomically write everything needed to continue the run after this epoch"""
+        arrays = dict(model.weight_arrays())
+        arrays.update({f"optimizer.{name}": value for name, value in optimizer.state_arrays().items()})
+        if best_weights:
+            arrays.update({f"best.{name}": value for name, value in best_weights.items()})
+        if split:
+            arrays['train_rows'], arrays['val_rows'] = split
+        save_bundle(self.checkpoint_path, arrays, {
+            "config": config,
+            "state": state,
+            "rng_state": rng.bit_generator.state
+        })
+    
+    def load_checkpoint(self, config):
+        """Return (arrays, meta) of the saved checkpoint, None if there is none; raise if incompatible"""
+        if not self.checkpoint_path.exists():
+            return None
+        
+        # Copy out of the file so the next checkpoint can replace it
+        arrays, meta = load_bundle(self.checkpoint_path, mmap=False)
+        saved = meta.get("config", {})
+        if saved.get("data_hash") != config["data_hash"]:
+            raise ValueError("training data or vocabulary changed since the checkpoint was written")
+        changed = sorted(key for key in config if key != "data_hash" and saved.get(key) != config[key])
+        if changed:
+            raise ValueError(f"checkpoint was written with different settings: {', '.join(changed)}")
+        return arrays, meta
+    
+    def train_model(self, epochs=1000, learning_rate=0.1, batch_size=None, shuffle=True, seed=None,
+                    export_json=False, validation_split=0.0, patience=None, monitor="val_loss", min_delta=0.0,
+                    min_epochs=0, hidden_size=8, optimizer="sgd", output="sigmoid", target_accuracy=None,
+                    checkpoint_every=None, resume=False, telemetry_path=None, epoch_callback=None,
+                    trace_memory=False, build_cache=False, force=False):
         print("🧠 Training AI model...")
+        start_time = time.perf_counter()
         
-        training_data = self.generate_training_data()
+        build_key = None
+        if build_cache:
+            build_key = self.build_cache_key({
+                "epochs": epochs, "learning_rate": learning_rate, "batch_size": batch_size, "shuffle": shuffle,
+                "seed": seed, "validation_split": validation_split, "patience": patience, "monitor": monitor,
+                "min_delta": min_delta, "min_epochs": min_epochs, "hidden_size": hidden_size, "optimizer": optimizer, "output": output
+            })
+            info = None if force else self.restore_build(build_key)
+            if info is not None:
+                elapsed = time.perf_counter() - start_time
+                print(f"♻️  Training inputs unchanged, restored model {build_key[:12]} from the build cache "
+                      f"in {elapsed:.2f}s (use --force to retrain)")
+                return {"cached": True, "build_key": build_key, "epochs_run": info.get("epochs"),
+                        "elapsed_seconds": elapsed}
         
-        if not training_data:
+        X, labels = self.load_training_matrix()
+        
+        if not len(labels):
             print("❌ No training data available")
             return
         
-        self.training_data_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.training_data_path, 'w') as f:
-            json.dump(training_data, f, indent=2)
+        if export_json:
+            self.export_training_data()
         
-        input_size = len(self.brain.vocab)
+        config = self.checkpoint_config(
+            hidden_size=hidden_size, learning_rate=learning_rate, batch_size=batch_size, shuffle=shuffle,
+            seed=seed, validation_split=validation_split, optimizer=optimizer, output=output
+        )
+        checkpoint = None
+        if resume:
+            try:
+                checkpoint = self.load_checkpoint(config)
+            except (OSError, ValueError) as e:
+                print(f"❌ Cannot resume from {self.checkpoint_path}: {e}")
+                return None
+            if checkpoint is None:
+                print("⚠️  No checkpoint found, starting from epoch 0")
+        
+        input_size = self.brain.input_size()
         output_size = len(self.brain.intents)
-        self.brain.model = NeuralNetwork(input_size, 8, output_size)
+        # One generator drives initial weights, the split and batch order, so the seed fixes the model
+        rng = np.random.default_rng(seed)
+        model = NeuralNetwork(input_size, hidden_size, output_size, output, rng)
+        optimizer_name = optimizer
+        optimizer = make_optimizer(optimizer_name, learning_rate)
         
-        X = np.array([data['input'] for data in training_data])
-        y = np.array([data['target'] for data in training_data])
+        split = None
+        if checkpoint:
+            if 'val_rows' in checkpoint[0]:
+                split = (np.array(checkpoint[0]['train_rows']), np.array(checkpoint[0]['val_rows']))
+        elif validation_split > 0:
+            split = self.split_validation(labels, validation_split, rng)
+            if not len(split[1]):
+                split = None
         
-        for epoch in range(epochs):
-            hidden = self.brain.model.sigmoid(np.dot(X, self.brain.model.weights1) + self.brain.model.bias1)
-            output = self.brain.model.sigmoid(np.dot(hidden, self.brain.model.weights2) + self.brain.model.bias2)
-            
-            error = y - output
-            delta_output = error * output * (1 - output)
+        if patience and not split:
+            print("⚠️  Early stopping needs a validation split, training every epoch")
+        
+        X_val, labels_val = None, None
+        if split:
+            train_rows, val_rows = split
+            X_val, labels_val = X.take(val_rows), labels[val_rows]
+            X, labels = X.take(train_rows), labels[train_rows]
+        
+        state = {
+            "epoch": -1,
+            "best_epoch": epochs - 1,
+            "best_score": None,
+            "val_loss": None,
+            "val_accuracy": None,
+            "epochs_without_improvement": 0,
+            "target_epoch": None,
+            "elapsed_seconds": 0.0
+        }
+        best_weights = None
+        
+        if checkpoint:
+            arrays, meta = checkpoint
+            for name in model.weight_arrays():
+                setattr(model, name, np.array(arrays[name]))
+            optimizer.load_state_arrays({name.split(".", 1)[1]: value for name, value in arrays.items()
+                                         if name.startswith("optimizer.")})
+            best_weights = {name.split(".", 1)[1]: np.array(value) for name, value in arrays.items()
+                            if name.startswith("best.")} or None
+            rng.bit_generator.state = meta["rng_state"]
+            state.update(meta["state"])
+            print(f"⏯️  Resuming from epoch {state['epoch'] + 1}")
+        
+        stopped_early = False
+        # Squared error is averaged per output, cross-entropy per sample
+        loss_scale = len(labels) * (output_size if output == "sigmoid" else 1)
+        
+        telemetry = TrainingTelemetry(telemetry_path, epoch_callback, trace_memory)
+        telemetry.start(train_samples=len(labels), val_samples=0 if labels_val is None else len(labels_val),
+                        vocab_size=input_size, intents=output_size, nnz=X.nnz, start_epoch=state["epoch"] + 1,
+                        epochs=epochs, **config)
+        
+        for epoch in range(state["epoch"] + 1, epochs):
+            epoch_start = time.perf_counter()
+            epoch_loss = 0.0
+            for X_batch, labels_batch in self.iterate_batches(X, labels, batch_size, shuffle, rng):
+                epoch_loss += self.train_step(model, X_batch, labels_batch, optimizer)
+            train_seconds = time.perf_counter() - epoch_start
+            state["epoch"] = epoch
             
-            error_hidden = delta_output.dot(self.brain.model.weights2.T)
-            delta_hidden = error_hidden * hidden * (1 - hidden)
+            if epoch % 100 == 0:
+                print(f"Epoch {epoch}, Loss: {epoch_loss / loss_scale:.4f}")
             
-            self.brain.model.weights2 += hidden.T.dot(delta_output) * learning_rate
-            self.brain.model.bias2 += np.sum(delta_output, axis=0, keepdims=True) * learning_rate
-            self.brain.model.weights1 += X.T.dot(delta_hidden) * learning_rate
-            self.brain.model.bias1 += np.sum(delta_hidden, axis=0, keepdims=True) * learning_rate
+            if X_val is None:
+                telemetry.record_epoch(epoch, train_seconds, len(labels), epoch_loss / loss_scale)
+            else:
+                eval_start = time.perf_counter()
+                val_loss, val_accuracy = self.evaluate(model, X_val, labels_val)
+                telemetry.record_epoch(epoch, train_seconds, len(labels), epoch_loss / loss_scale,
+                                       time.perf_counter() - eval_start, val_loss, val_accuracy)
+                if target_accuracy is not None and state["target_epoch"] is None and val_accuracy >= target_accuracy:
+                    state["target_epoch"] = epoch
+                # Without early stopping, or during warmup, the latest epoch is the result
+                if not patience or epoch < min_epochs:
+                    state.update(best_epoch=epoch, val_loss=val_loss, val_accuracy=val_accuracy)
+                else:
+                    # Lower is better for loss, higher for accuracy
+                    score = val_loss if monitor == "val_loss" else -val_accuracy
+                    if state["best_score"] is None or score < state["best_score"] - min_delta:
+                        state.update(best_score=score, best_epoch=epoch, val_loss=val_loss,
+                                     val_accuracy=val_accuracy, epochs_without_improvement=0)
+                        best_weights = {name: array.copy() for name, array in model.weight_arrays().items()}
+                    else:
+                        state["epochs_without_improvement"] += 1
+                        if state["epochs_without_improvement"] >= patience:
+                            stopped_early = True
+                            break
             
-            if epoch % 100 == 0:
-                loss = np.mean(np.square(error))
-                print(f"Epoch {epoch}, Loss: {loss:.4f}")
+            if checkpoint_every and (epoch + 1) % checkpoint_every == 0 and epoch + 1 < epochs:
+                elapsed = state["elapsed_seconds"] + time.perf_counter() - start_time
+                self.save_checkpoint(model, optimizer, rng, dict(state, elapsed_seconds=elapsed),
+                                     best_weights, split, config)
+        
+        epoch = state["epoch"]
+        best_epoch = state["best_epoch"]
+        result = {
+            "epochs_run": epoch + 1,
+            "best_epoch": best_epoch,
+            "stopped_early": stopped_early,
+            "train_samples": len(labels),
+            "val_samples": 0 if labels_val is None else len(labels_val),
+            "target_epoch": state["target_epoch"]
+        }
+        
+        if best_weights:
+            # Keep the best checkpoint rather than the last epoch's weights
+            for name, array in best_weights.items():
+                setattr(model, name, array)
+        if X_val is not None:
+            result["val_loss"] = state["val_loss"]
+            result["val_accuracy"] = state["val_accuracy"]
+        
+        result["elapsed_seconds"] = state["elapsed_seconds"] + time.perf_counter() - start_time
+        result["telemetry"] = telemetry.close()
+        if stopped_early:
+            print(f"⏹️  Early stopping at epoch {epoch}, best epoch {best_epoch} "
+                  f"(after {result['elapsed_seconds']:.1f}s)")
+        if X_val is not None:
+            print(f"📈 Validation accuracy {state['val_accuracy']:.2%}, loss {state['val_loss']:.4f}")
         
+        # Publishing the trained weights invalidates cached predictions
+        self.brain.model = model
+        self.brain.training_info = {
+            "hidden_size": hidden_size,
+            "learning_rate": learning_rate,
+            "epochs": result["epochs_run"],
+            "batch_size": batch_size,
+            "optimizer": optimizer_name,
+            "output": output
+        }
+        if build_key:
+            self.brain.training_info["build_key"] = build_key
         print("✅ Training complete!")
-        self.brain.save_data()
\ No newline at end of file
+        self.brain.save_data()
+        if build_key:
+            self.store_build(build_key)
+        # The run finished, so there is nothing left to resume
+        self.checkpoint_path.unlink(missing_ok=True)
+        return result
+    
+    def update_model(self, intents, epochs=50, learning_rate=0.1, batch_size=32, replay_ratio=2.0, seed=None,
+                     optimizer="sgd"):
+        """Warm-start the loaded model on new patterns, words and intents without a full retrain
+        
+        New words are appended to the vocabulary so existing indices never move,
+        and weights1/weights2 gain rows and columns for them. Training runs a
+        short schedule over the new patterns plus a replayed sample of known ones.
+        """
+        if not self.brain.model:
+            print("❌ No trained model to update, run a full train first")
+            return None
+        
+        start_time = time.perf_counter()
+        old_model = self.brain.model.to_precision("float64")
+        old_columns = {intent['tag']: idx for idx, intent in enumerate(self.brain.intents)}
+        known_patterns = {(intent['tag'], pattern) for intent in self.brain.intents for pattern in intent['patterns']}
+        
+        # Follow the source exactly, so the bundle's data hash matches the data on
+        # disk; columns of intents that disappeared from the source are dropped
+        merged = list(intents)
+        
+        new_rows = []
+        replay_rows = []
+        patterns = []
+        labels = []
+        for intent_idx, intent in enumerate(merged):
+            for pattern in intent['patterns']:
+                (replay_rows if (intent['tag'], pattern) in known_patterns else new_rows).append(len(patterns))
+                patterns.append(pattern)
+                labels.append(intent_idx)
+        
+        vocab = dict(self.brain.vocab)
+        for pattern in (patterns[row] for row in new_rows):
+            for word in self.brain.tokenizer.tokenize(pattern):
+                if word not in vocab:
+                    vocab[word] = len(vocab)
+        new_words = len(vocab) - len(self.brain.vocab)
+        new_intents = [intent['tag'] for intent in merged if intent['tag'] not in old_columns]
+        removed_intents = len(set(old_columns) - {intent['tag'] for intent in merged})
+        
+        if not new_rows and [intent['tag'] for intent in merged] == list(old_columns):
+            print("✅ Model already covers every pattern")
+            return {"new_patterns": 0, "new_words": 0, "new_intents": 0, "epochs_run": 0,
+                    "elapsed_seconds": time.perf_counter() - start_time}
+        
+        # Grow the weights: new words start at zero so old predictions are untouched,
+        # new intents start with small weights and a low bias. Hashed features
+        # have a fixed width, so only the intent columns grow.
+        hidden_size = old_model.weights1.shape[1]
+        added_inputs = 0 if self.brain.featurizer else new_words
+        weights1 = np.vstack([old_model.weights1, np.zeros((added_inputs, hidden_size))])
+        weights2 = np.empty((hidden_size, len(merged)))
+        bias2 = np.empty((1, len(merged)))
+        rng = np.random.default_rng(seed)
+        for idx, intent in enumerate(merged):
+            column = old_columns.get(intent['tag'])
+            if column is None:
+                weights2[:, idx] = rng.standard_normal(hidden_size) * 0.1
+                bias2[0, idx] = -4.0
+            else:
+                weights2[:, idx] = old_model.weights2[:, column]
+                bias2[0, idx] = old_model.bias2[0, column]
+        model = NeuralNetwork.from_weights(weights1, weights2, np.array(old_model.bias1), bias2,
+                                           output=old_model.output)
+        optimizer = make_optimizer(optimizer, learning_rate)
+        
+        replay_count = min(len(replay_rows), int(max(1, len(new_rows)) * replay_ratio))
+        rows = np.array(new_rows + list(rng.choice(replay_rows, replay_count, replace=False)), dtype=np.int64)
+        
+        self.brain.vocab = vocab
+        self.brain.intents = merged
+        X = self.brain.texts_to_matrix([patterns[row] for row in rows])
+        y = np.array(labels, dtype=np.int64)[rows]
+        
+        print(f"🧠 Updating model: {len(new_rows)} new patterns, {new_words} new words, "
+              f"{len(new_intents)} new intents, {removed_intents} removed, {replay_count} replayed")
+        for epoch in range(epochs):
+            for X_batch, labels_batch in self.iterate_batches(X, y, batch_size, True, rng):
+                self.train_step(model, X_batch, labels_batch, optimizer)
+        
+        # Drop every view of the old weights: they may map the bundle save_data replaces
+        del old_model
+        self.brain.model = model
+        self.brain.training_info = dict(self.brain.training_info, incremental_epochs=epochs)
+        self.brain.save_data()
+        self.brain.refresh_artifacts_manifest()
+        
+        result = {
+            "new_patterns": len(new_rows),
+            "new_words": new_words,
+            "new_intents": len(new_intents),
+            "removed_intents": removed_intents,
+            "replayed": replay_count,
+            "epochs_run": epochs,
+            "elapsed_seconds": time.perf_counter() - start_time
+        }
+        print(f"✅ Incremental update complete in {result['elapsed_seconds']:.1f}s")
+        return result
+    
+    def precision_report(self, repeats=5):
+        """Compare float32/int8 inference against the float64 model on the training patterns"""
+        if not self.brain.model:
+            print("❌ No trained model available")
+            return []
+        
+        X, labels = self.generate_training_matrix()
+        # The loaded model is already at the configured precision, so compare
+        # against the weights as the bundle stores them
+        reference_model = self.brain.stored_model().to_precision("float64")
+        reference = np.argmax(reference_model.predict(X), axis=1)
+        
+        report = []
+        for precision in PRECISIONS:
+            model = reference_model.to_precision(precision)
+            start = time.perf_counter()
+            for _ in range(repeats):
+                predicted = np.argmax(model.predict(X), axis=1)
+            elapsed = (time.perf_counter() - start) / repeats
+            report.append({
+                "precision": precision,
+                "agreement": float(np.mean(predicted == reference)),
+                "accuracy": float(np.mean(predicted == labels)),
+                "weight_bytes": model.nbytes(),
+                "batch_ms": elapsed * 1000
+            })
+        
+        return report
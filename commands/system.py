@@ -1,5 +1,4 @@
 import platform
-import psutil
 import socket
 import datetime
 import os
@@ -9,6 +8,7 @@ from datetime import datetime, timedelta
 
 def handle_system_command():
     """Get comprehensive system information"""
+    import psutil  # deferred so CLI startup does not pay for it
     try:
         info = {
             "System": platform.system(),
@@ -35,6 +35,7 @@ def handle_system_command():
 
 def handle_process_list(limit=15):
     """List running processes"""
+    import psutil
     try:
         processes = []
         for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
@@ -63,6 +64,7 @@ def handle_process_list(limit=15):
 
 def handle_disk_usage():
     """Show disk usage information"""
+    import psutil
     try:
         partitions = psutil.disk_partitions()
         result = ["💾 Disk Usage:"]
@@ -85,6 +87,7 @@ def handle_disk_usage():
 
 def handle_network_info():
     """Show network information"""
+    import psutil
     try:
         interfaces = psutil.net_if_addrs()
         stats = psutil.net_io_counters()
@@ -109,6 +112,7 @@ def handle_network_info():
 
 def handle_system_uptime():
     """Show system uptime with detailed information"""
+    import psutil
     try:
         boot_time = psutil.boot_time()
         uptime_seconds = time.time() - boot_time
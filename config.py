@@ -8,8 +8,32 @@ MODEL_CONFIG = {
     "hidden_size": 8,
     "output_size": 10,
     "learning_rate": 0.1,
+    "optimizer": "sgd",  # sgd, momentum or adam
+    "output": "sigmoid",  # sigmoid with squared error, or softmax with cross-entropy
+    "confidence_threshold": 0.3,  # minimum top score to trust the network over the fallback
     "epochs": 1000,
+    "batch_size": None,  # None trains full-batch
+    "shuffle": True,
+    "seed": None,
+    "validation_split": 0.0,  # stratified hold-out per intent, excluded from the model; e.g. 0.1 with early stopping
+    "early_stopping_patience": None,  # e.g. 100 epochs without improvement (needs validation_split); None trains every epoch
+    "early_stopping_min_epochs": 300,  # warmup before the best epoch is tracked; SGD plateaus early
+    "early_stopping_monitor": "val_loss",  # or val_accuracy
+    "early_stopping_min_delta": 1e-4,
+    "checkpoint_every": 50,  # epochs between resumable checkpoints, None disables
+    "build_cache": True,  # reuse the trained model when data, code and settings are unchanged
+    "telemetry_dir": "brain/telemetry",  # per-epoch JSON Lines records of each train run
+    "incremental_epochs": 50,  # train --incremental
+    "incremental_replay_ratio": 2.0,  # known patterns replayed per new pattern
+    "export_training_json": False,  # debug dump of dense vectors to training_data.json
+    "augmentation_budget": None,  # generate-data patterns per intent (base and new-token variants always kept), None keeps every variant
+    "tokenizer_stem": False,  # strip plural/-ing/-ed suffixes when tokenizing
+    "feature_hashing_dim": None,  # e.g. 4096 for fixed-width hashed features; None uses vocab indices
+    "feature_bigrams": False,  # also hash adjacent word pairs (hashed features only)
+    "cache_size": 1024,
+    "precision": "float64",  # float64, float32 or int8 inference
     "model_path": "brain/models/aetherium_model.npy",
+    "bundle_path": "brain/models/aetherium_model.bundle",
     "vocab_path": "brain/data/vocab.json",
     "intents_path": "brain/data/intents.json"
 }
@@ -0,0 +1,152 @@
+# data_pipeline.py
+import importlib
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from brain.data_generator import GENERATED_INTENTS_PATH, GENERATED_VOCAB_PATH
+from brain.hashing import sha256_file, sha256_json
+from windows_data_merger import DATA_FILES, OUTPUT_PATH, source_files, write_json
+
+BUILD_MANIFEST_PATH = Path("brain/data/build_manifest.json")
+BUILD_MANIFEST_VERSION = 1
+
+class Stage:
+    """One build step: a module-level function with declared input and output files
+
+    Stages that produce another stage's inputs are its dependencies, so the
+    graph follows from the declarations alone.
+    """
+
+    def __init__(self, name, module, function, inputs, outputs, kwargs=None):
+        self.name = name
+        self.module = module
+        self.function = function
+        self.inputs = [str(path) for path in inputs]
+        self.outputs = [str(path) for path in outputs]
+        self.kwargs = kwargs or {}
+
+    def key(self):
+        """Content hash of everything the stage reads: code, settings and input files"""
+        return sha256_json({
+            "function": f"{self.module}.{self.function}",
+            "kwargs": self.kwargs,
+            "inputs": {path: sha256_file(path) if Path(path).exists() else None for path in self.inputs}
+        })
+
+    def job(self):
+        return {"module": self.module, "function": self.function, "kwargs": self.kwargs}
+
+def run_stage(job):
+    """Run one stage; runs inside a worker process"""
+    start = time.perf_counter()
+    getattr(importlib.import_module(job["module"]), job["function"])(**job["kwargs"])
+    return time.perf_counter() - start
+
+def data_stages(seed=0, budget=None, stem=False, drop_conflicts=False):
+    """The training data build: three Windows command sources, their merge, and the generated intents"""
+    manual, powershell, admin = DATA_FILES
+    return [
+        Stage("windows-manual", "windows_commands_manual", "save_windows_data",
+              ["windows_commands_manual.py"], [manual]),
+        Stage("powershell", "powershell_data", "save_powershell_data",
+              ["powershell_data.py"], [powershell]),
+        Stage("windows-admin", "windows_admin_commands", "save_admin_data",
+              ["windows_admin_commands.py"], [admin]),
+        Stage("merge", "windows_data_merger", "merge_windows_data",
+              ["windows_data_merger.py", "brain/tokenizer.py"] + source_files(), [OUTPUT_PATH],
+              {"drop_conflicts": drop_conflicts}),
+        Stage("generate", "brain.data_generator", "generate_training_data",
+              ["brain/data_generator.py", "brain/tokenizer.py"],
+              [GENERATED_INTENTS_PATH, GENERATED_VOCAB_PATH],
+              {"seed": seed, "budget": budget, "stem": stem})
+    ]
+
+def load_build_manifest(path=BUILD_MANIFEST_PATH):
+    try:
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest.get("stages", {}) if manifest.get("version") == BUILD_MANIFEST_VERSION else {}
+
+def is_up_to_date(stage, key, entry):
+    """A stage is current if its key matches and its outputs are the ones it last wrote"""
+    if not entry or entry.get("key") != key:
+        return False
+    outputs = entry.get("outputs", {})
+    return all(Path(path).exists() and sha256_file(path) == outputs.get(path) for path in stage.outputs)
+
+def build_data(stages, force=False, workers=None, manifest_path=BUILD_MANIFEST_PATH):
+    """Run every stage whose inputs changed, independent stages in parallel
+
+    Keys are computed once a stage's dependencies have finished, so a
+    dependency that rebuilds to identical output does not rebuild the
+    stages after it. Returns {stage: {"status", "seconds"}} in stage order.
+    """
+    manifest_path = Path(manifest_path)
+    producers = {path: stage.name for stage in stages for path in stage.outputs}
+    deps = {stage.name: {producers[path] for path in stage.inputs if path in producers} for stage in stages}
+    manifest = {} if force else load_build_manifest(manifest_path)
+    pending = {stage.name: stage for stage in stages}
+    running = {}
+    results = {}
+
+    def save_manifest():
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        write_json(manifest_path, {"version": BUILD_MANIFEST_VERSION, "stages": manifest})
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            progressed = False
+            for name, stage in list(pending.items()):
+                if deps[name] & (pending.keys() | {s.name for s, _, _ in running.values()}):
+                    continue
+                del pending[name]
+                progressed = True
+                if any(results[dep]["status"] in ("failed", "skipped") for dep in deps[name]):
+                    print(f"⚠️  {name}: skipped, a dependency failed")
+                    results[name] = {"status": "skipped", "seconds": 0.0}
+                    continue
+
+                hash_start = time.perf_counter()
+                key = stage.key()
+                if is_up_to_date(stage, key, manifest.get(name)):
+                    print(f"♻️  {name}: up to date")
+                    results[name] = {"status": "cached", "seconds": time.perf_counter() - hash_start}
+                else:
+                    running[pool.submit(run_stage, stage.job())] = (stage, key, time.perf_counter() - hash_start)
+
+            if not running:
+                if pending and not progressed:
+                    raise ValueError(f"Stage graph has a cycle through {sorted(pending)}")
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, key, hash_seconds = running.pop(future)
+                try:
+                    seconds = future.result() + hash_seconds
+                    manifest[stage.name] = {"key": key,
+                                            "outputs": {path: sha256_file(path) for path in stage.outputs}}
+                    save_manifest()
+                    results[stage.name] = {"status": "built", "seconds": seconds}
+                except Exception as e:
+                    print(f"❌ {stage.name} failed: {e}")
+                    results[stage.name] = {"status": "failed", "seconds": 0.0}
+
+    results = {stage.name: results[stage.name] for stage in stages}
+    print_build(results, time.perf_counter() - start)
+    return results
+
+def print_build(results, wall_seconds):
+    print("📊 Data build")
+    for name, result in results.items():
+        print(f"  {name:16} {result['status']:8} {result['seconds']:8.3f}s")
+    stage_seconds = sum(result["seconds"] for result in results.values())
+    built = sum(result["status"] == "built" for result in results.values())
+    print(f"⏱️  {wall_seconds:.3f}s wall, {stage_seconds:.3f}s in stages, {built}/{len(results)} rebuilt")
+
+if __name__ == "__main__":
+    build_data(data_stages())
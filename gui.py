@@ -22,7 +22,7 @@ from commands import (
     delete_file,
     execute_command
 )
-from config import GUI_CONFIG, APP_CONFIG
+from config import GUI_CONFIG, APP_CONFIG, MODEL_CONFIG
 
 class AetheriumGUI:
     def __init__(self, root):
@@ -44,7 +44,7 @@ class AetheriumGUI:
             'button_active': '#6A0DAD',  # Darker purple when pressed
         }
         
-        self.brain = AetheriumBrain()
+        self.brain = AetheriumBrain.from_config(MODEL_CONFIG)
         self.setup_gui()
         self.apply_theme()
     
@@ -3,11 +3,9 @@ from typing import Annotated, Optional, List
 import sys
 import os
 from pathlib import Path
-from brain.data_generator import generate_training_data
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from brain import AetheriumBrain, ModelTrainer
 from commands import (
     handle_system_command,
     handle_process_list,
@@ -32,29 +30,67 @@ from config import APP_CONFIG, MODEL_CONFIG, COMMAND_CONFIG
 
 app = typer.Typer(help=APP_CONFIG["description"])
 
-brain = AetheriumBrain()
-trainer = ModelTrainer(brain)
+_brain = None
+_trainer = None
+
+def get_brain():
+    """Build the AI brain on first use; only intent-based commands need it"""
+    global _brain
+    if _brain is None:
+        from brain import AetheriumBrain
+        _brain = AetheriumBrain.from_config(MODEL_CONFIG)
+    return _brain
+
+def get_trainer():
+    global _trainer
+    if _trainer is None:
+        from brain import ModelTrainer
+        _trainer = ModelTrainer(get_brain())
+    return _trainer
 
 @app.command(name="generate-data")
 def generate_data_command(
     overwrite: Annotated[bool, typer.Option(
         "--overwrite", "-o",
         help="Overwrite existing data files"
-    )] = False
+    )] = False,
+    budget: Annotated[Optional[int], typer.Option(help="Target patterns per intent, counting base patterns and new-token variants; those are always kept, so an intent may exceed it")] = MODEL_CONFIG["augmentation_budget"]
 ):
     """Generate training data for the AI model"""
-    if not overwrite and (Path("brain/data/intents.json").exists() or 
-                         Path("brain/data/vocab.json").exists()):
+    from brain.data_generator import GENERATED_INTENTS_PATH, GENERATED_VOCAB_PATH, generate_training_data
+    if not overwrite and (GENERATED_INTENTS_PATH.exists() or GENERATED_VOCAB_PATH.exists()):
         if not typer.confirm("Data files already exist. Overwrite?"):
             print("❌ Data generation cancelled.")
             return
     
-    generate_training_data()
+    generate_training_data(MODEL_CONFIG["seed"] or 0, budget, MODEL_CONFIG["tokenizer_stem"])
     print("✅ Training data generated successfully!")
     print("💡 Now train the model with: python main.py train")
 
+@app.command(name="merge-data")
+def merge_data_command(
+    force: Annotated[bool, typer.Option("--force", help="Re-parse every source even if unchanged")] = False,
+    drop_conflicts: Annotated[bool, typer.Option("--drop-conflicts", help="Keep patterns claimed by several intents only under the first")] = False,
+    workers: Annotated[Optional[int], typer.Option(help="Parallel source loaders")] = None
+):
+    """Merge the Windows command sources into combined_windows_commands.json"""
+    from windows_data_merger import merge_windows_data
+    merge_windows_data(force=force, drop_conflicts=drop_conflicts, workers=workers)
+
+@app.command(name="build-data")
+def build_data_command(
+    force: Annotated[bool, typer.Option("--force", help="Rebuild every stage even if its inputs are unchanged")] = False,
+    workers: Annotated[Optional[int], typer.Option(help="Parallel stage workers (default: all cores)")] = None
+):
+    """Build all training data, rebuilding only stages whose inputs changed"""
+    from data_pipeline import build_data, data_stages
+    stages = data_stages(MODEL_CONFIG["seed"] or 0, MODEL_CONFIG["augmentation_budget"], MODEL_CONFIG["tokenizer_stem"])
+    results = build_data(stages, force=force, workers=workers)
+    if any(result["status"] == "failed" for result in results.values()):
+        raise typer.Exit(code=1)
+
 def process_command(user_input):
-    intent = brain.predict_intent(user_input)
+    intent = get_brain().predict_intent(user_input)
     
     # Handle different intents with enhanced capabilities
     if intent['tag'] == 'greeting':
@@ -154,6 +190,38 @@ def chat_mode(
                 print("\n👋 Goodbye!")
                 break
 
+@app.command(name="classify")
+def classify_command(
+    source: Annotated[Optional[str], typer.Argument(help="File with one input per line (default: stdin)")] = None,
+    batch_size: Annotated[int, typer.Option(help="Inputs scored per forward pass")] = 512,
+    stats: Annotated[bool, typer.Option("--stats", help="Print cache and pattern index hit rates")] = False
+):
+    """Classify many inputs in batches, printing one intent tag per line"""
+    brain = get_brain()
+    stream = open(source, 'r') if source else sys.stdin
+    try:
+        batch = []
+        for line in stream:
+            batch.append(line.rstrip("\n"))
+            if len(batch) >= batch_size:
+                for text, intent in zip(batch, brain.predict_intents(batch)):
+                    print(f"{intent['tag']}\t{text}")
+                batch = []
+        if batch:
+            for text, intent in zip(batch, brain.predict_intents(batch)):
+                print(f"{intent['tag']}\t{text}")
+    finally:
+        if source:
+            stream.close()
+    
+    if stats:
+        cache = brain.cache_stats()
+        index = brain.index_stats()
+        print(f"📊 Cache: {cache['hits']} hits, {cache['misses']} misses, "
+              f"{cache['evictions']} evictions ({cache['hit_rate']:.1%})", file=sys.stderr)
+        print(f"📊 Pattern index: {index['hits']}/{index['lookups']} exact hits "
+              f"({index['hit_rate']:.1%}) over {index['size']} patterns", file=sys.stderr)
+
 @app.command(name="run")
 def run_command(
     command: Annotated[str, typer.Argument(help="Command to execute")],
@@ -238,12 +306,217 @@ def services_command():
 
 @app.command(name="train")
 def train_model(
-    epochs: Annotated[int, typer.Option(help="Number of training epochs")] = MODEL_CONFIG["epochs"]
+    epochs: Annotated[int, typer.Option(help="Number of training epochs")] = MODEL_CONFIG["epochs"],
+    batch_size: Annotated[Optional[int], typer.Option(help="Mini-batch size (default: full batch)")] = MODEL_CONFIG["batch_size"],
+    export_json: Annotated[bool, typer.Option("--export-json", help="Also dump dense training vectors to JSON")] = MODEL_CONFIG["export_training_json"],
+    incremental: Annotated[bool, typer.Option("--incremental", help="Warm-start the saved model on new patterns only")] = False,
+    resume: Annotated[bool, typer.Option("--resume", help="Continue an interrupted run from its last checkpoint")] = False,
+    trace_memory: Annotated[bool, typer.Option("--trace-memory", help="Track peak Python allocations with tracemalloc (slower)")] = False,
+    force: Annotated[bool, typer.Option("--force", help="Retrain even if the build cache has a model for these inputs")] = False
 ):
     print("🧠 Training Aetherium AI model...")
-    trainer.train_model(epochs=epochs)
+    if incremental:
+        brain = get_brain()
+        # The brain holds the current source data; the bundle holds the last trained model
+        source_intents = list(brain.intents)
+        if not brain.bundle_path.exists():
+            print("❌ No saved model to update, run: python main.py train")
+            return
+        # Startup no longer checks the bundle, so changed source data is expected here;
+        # only a bundle built with other feature settings cannot be warm-started
+        if not brain.load_bundle(expected_features=brain.feature_spec()):
+            return
+        get_trainer().update_model(
+            source_intents,
+            epochs=MODEL_CONFIG["incremental_epochs"],
+            learning_rate=MODEL_CONFIG["learning_rate"],
+            batch_size=batch_size or 32,
+            replay_ratio=MODEL_CONFIG["incremental_replay_ratio"],
+            seed=MODEL_CONFIG["seed"],
+            optimizer=MODEL_CONFIG["optimizer"]
+        )
+        return
+    
+    import time
+    from brain.telemetry import print_summary
+    telemetry_path = Path(MODEL_CONFIG["telemetry_dir"]) / f"train_{time.strftime('%Y%m%d_%H%M%S')}.jsonl"
+    result = get_trainer().train_model(
+        epochs=epochs,
+        learning_rate=MODEL_CONFIG["learning_rate"],
+        hidden_size=MODEL_CONFIG["hidden_size"],
+        optimizer=MODEL_CONFIG["optimizer"],
+        output=MODEL_CONFIG["output"],
+        batch_size=batch_size,
+        shuffle=MODEL_CONFIG["shuffle"],
+        seed=MODEL_CONFIG["seed"],
+        export_json=export_json,
+        validation_split=MODEL_CONFIG["validation_split"],
+        patience=MODEL_CONFIG["early_stopping_patience"],
+        monitor=MODEL_CONFIG["early_stopping_monitor"],
+        min_delta=MODEL_CONFIG["early_stopping_min_delta"],
+        min_epochs=MODEL_CONFIG["early_stopping_min_epochs"],
+        checkpoint_every=MODEL_CONFIG["checkpoint_every"],
+        resume=resume,
+        telemetry_path=telemetry_path,
+        trace_memory=trace_memory,
+        build_cache=MODEL_CONFIG["build_cache"],
+        force=force
+    )
+    if result and not result.get("cached"):
+        print(f"⏱️  Stopped after {result['epochs_run']} epochs in {result['elapsed_seconds']:.1f}s "
+              f"(best epoch {result['best_epoch']})")
+        print_summary(result["telemetry"])
+        print(f"💾 Per-epoch telemetry saved to {telemetry_path}")
     print("✅ Training complete!")
 
+@app.command(name="convert-model")
+def convert_model_command():
+    """Convert the legacy pickled model into a single-file bundle"""
+    try:
+        get_brain().convert_legacy_model()
+    except Exception as e:
+        print(f"❌ Could not convert model: {e}")
+
+@app.command(name="precision-report")
+def precision_report_command():
+    """Compare float32 and int8 inference with the float64 model"""
+    get_brain().load_trained_model()
+    report = get_trainer().precision_report()
+    if not report:
+        return
+    
+    print(f"{'Precision':10} {'Agreement':>10} {'Accuracy':>9} {'Weights':>10} {'Batch':>9}")
+    for row in report:
+        print(f"{row['precision']:10} {row['agreement']:>9.2%} {row['accuracy']:>8.2%} "
+              f"{row['weight_bytes'] / 1024:>8.1f}KB {row['batch_ms']:>7.2f}ms")
+
+@app.command(name="export-model")
+def export_model_command(
+    output: Annotated[str, typer.Argument(help="Bundle file to write")],
+    precision: Annotated[str, typer.Option(help="float64, float32 or int8")] = "int8"
+):
+    """Export the trained model as a bundle in another precision"""
+    brain = get_brain()
+    if not brain.load_trained_model():
+        print("❌ No trained model available, run: python main.py train")
+        return
+    brain.export_bundle(output, precision)
+    print(f"✅ Exported {precision} model to {output}")
+
+@app.command(name="benchmark")
+def benchmark_command(
+    vocab_sizes: Annotated[str, typer.Option(help="Comma-separated synthetic vocab sizes")] = "200,2000,20000",
+    intents: Annotated[str, typer.Option(help="Comma-separated synthetic intent counts")] = "14,50",
+    queries: Annotated[int, typer.Option(help="Queries per configuration")] = 500,
+    batch_size: Annotated[int, typer.Option(help="Batch size for predict_intents")] = 256,
+    output: Annotated[Optional[str], typer.Option(help="JSON results file")] = None,
+    baseline: Annotated[Optional[str], typer.Option(help="Earlier results file to compare against")] = None
+):
+    """Measure inference latency and throughput on synthetic corpora"""
+    import json
+    import time
+    from brain.benchmark import run_suite, save_results, compare_results, print_results
+    
+    report = run_suite(
+        vocab_sizes=[int(v) for v in vocab_sizes.split(",")],
+        intent_counts=[int(v) for v in intents.split(",")],
+        queries=queries,
+        batch_size=batch_size
+    )
+    print_results(report)
+    
+    output = output or f"brain/benchmarks/benchmark_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    print(f"💾 Saved results to {save_results(report, output)}")
+    
+    if baseline:
+        with open(baseline, 'r') as f:
+            regressions = compare_results(report, json.load(f))
+        if not regressions:
+            print("✅ No p95 regressions against baseline")
+        for r in regressions:
+            print(f"⚠️  {r['timing']} (vocab={r['vocab_size']}, intents={r['intent_count']}): "
+                  f"{r['baseline']:.3f}ms -> {r['current']:.3f}ms ({r['ratio']:.2f}x)")
+
+@app.command(name="train-benchmark")
+def train_benchmark_command(
+    target: Annotated[float, typer.Option(help="Validation accuracy to reach")] = 0.8,
+    epochs: Annotated[int, typer.Option(help="Epoch budget per configuration")] = MODEL_CONFIG["epochs"],
+    batch_size: Annotated[Optional[int], typer.Option(help="Mini-batch size (default: full batch)")] = MODEL_CONFIG["batch_size"]
+):
+    """Compare epochs and wall time to a target accuracy across output heads and optimizers"""
+    from brain.benchmark import benchmark_convergence, print_convergence
+    
+    results = benchmark_convergence(
+        get_trainer(),
+        target_accuracy=target,
+        epochs=epochs,
+        batch_size=batch_size,
+        hidden_size=MODEL_CONFIG["hidden_size"],
+        validation_split=MODEL_CONFIG["validation_split"] or 0.1,
+        seed=MODEL_CONFIG["seed"] or 0
+    )
+    print_convergence(results, target)
+
+@app.command(name="feature-benchmark")
+def feature_benchmark_command(
+    epochs: Annotated[int, typer.Option(help="Training epochs per featurizer")] = 100,
+    synthetic_vocab: Annotated[Optional[int], typer.Option(help="Use a synthetic corpus with this many words instead of the bundled intents")] = None
+):
+    """Compare vocab-indexed and hashed features on the bundled intents"""
+    from brain.benchmark import benchmark_features, print_features, synthetic_intents
+    
+    intents = synthetic_intents(synthetic_vocab, 50) if synthetic_vocab else get_brain().intents
+    print_features(benchmark_features(intents, epochs=epochs, seed=MODEL_CONFIG["seed"] or 0))
+
+@app.command(name="augmentation-report")
+def augmentation_report_command(
+    budgets: Annotated[str, typer.Option(help="Comma-separated per-intent pattern budgets, 'all' for no cap")] = "all,400,100,25",
+    epochs: Annotated[int, typer.Option(help="Training epochs per budget")] = 30
+):
+    """Compare generated corpus size, training time and accuracy across augmentation budgets"""
+    from brain.benchmark import benchmark_augmentation, print_augmentation
+    
+    budgets = [None if value == "all" else int(value) for value in budgets.split(",")]
+    print_augmentation(benchmark_augmentation(budgets, epochs=epochs, seed=MODEL_CONFIG["seed"] or 0))
+
+@app.command(name="tokenizer-report")
+def tokenizer_report_command():
+    """Compare vocabulary size, model size and featurization time across tokenizer settings"""
+    from brain.benchmark import benchmark_tokenizers, print_tokenizers
+    
+    print_tokenizers(benchmark_tokenizers(get_brain().intents, seed=MODEL_CONFIG["seed"] or 0))
+
+@app.command(name="sweep")
+def sweep_command(
+    hidden_sizes: Annotated[str, typer.Option(help="Comma-separated hidden layer sizes")] = "8,16,32",
+    learning_rates: Annotated[str, typer.Option(help="Comma-separated learning rates")] = "0.01,0.05,0.1",
+    epochs: Annotated[str, typer.Option(help="Comma-separated epoch budgets")] = "100,300",
+    batch_size: Annotated[Optional[int], typer.Option(help="Mini-batch size (default: full batch)")] = 32,
+    workers: Annotated[Optional[int], typer.Option(help="Worker processes (default: all cores)")] = None,
+    apply: Annotated[bool, typer.Option("--apply", help="Save the best configuration as the active model")] = False
+):
+    """Train a hyperparameter grid in parallel and rank the results"""
+    from brain.sweep import run_sweep, apply_result, print_leaderboard
+    
+    results = run_sweep(
+        get_trainer(),
+        hidden_sizes=[int(v) for v in hidden_sizes.split(",")],
+        learning_rates=[float(v) for v in learning_rates.split(",")],
+        epoch_budgets=[int(v) for v in epochs.split(",")],
+        batch_size=batch_size,
+        validation_split=MODEL_CONFIG["validation_split"] or 0.1,
+        seed=MODEL_CONFIG["seed"] or 0,
+        workers=workers,
+        optimizer=MODEL_CONFIG["optimizer"],
+        output=MODEL_CONFIG["output"]
+    )
+    print_leaderboard(results)
+    
+    if apply and results:
+        apply_result(get_brain(), results[0])
+        best = results[0]
+        print(f"✅ Active model: hidden={best['hidden_size']}, lr={best['learning_rate']:g}, epochs={best['epochs']}")
+
 @app.command(name="help")
 def show_help():
     help_text = f"""
@@ -251,6 +524,7 @@ def show_help():
 
 📋 Available Commands:
   chat [message]    - Chat with Aetherium AI
+  classify [file]   - Classify one input per line in batches
   run <command>     - Execute system command
   files [dir]       - List files in directory
   create <file>     - Create a new file
@@ -265,7 +539,18 @@ def show_help():
   env               - Show environment variables
   services          - Show running services
   generate-data     - Generate training data
+  merge-data        - Merge Windows command sources
+  build-data        - Build all training data (cached stages)
   train             - Train the AI model
+  sweep             - Parallel hyperparameter sweep
+  convert-model     - Convert legacy .npy model to a bundle
+  precision-report  - Compare float32/int8 inference accuracy
+  export-model      - Export a float32/int8 model bundle
+  benchmark         - Measure inference latency and throughput
+  train-benchmark   - Compare optimizer convergence speed
+  feature-benchmark - Compare vocab and hashed features
+  augmentation-report - Compare augmentation budgets
+  tokenizer-report  - Compare tokenizer settings
   help              - Show this help
   gui               - Launch GUI interface
   version           - Show version information
@@ -65,7 +65,7 @@ def create_minimal_data():
         ]
     }
     
-    data_path = Path("brain/data/intents.json")
+    data_path = Path("brain/data/generated_intents.json")
     data_path.parent.mkdir(parents=True, exist_ok=True)
     
     with open(data_path, 'w') as f:
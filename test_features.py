@@ -5,6 +5,9 @@ Test script to verify all Aetherium features are working
 
 import os
 import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from brain import AetheriumBrain
@@ -24,6 +27,26 @@ from commands import (
     execute_command
 )
 
+@contextmanager
+def scratch_trainer(intents, **brain_options):
+    """A brain built over intents and its trainer, with every file they write in a temporary directory"""
+    from brain.benchmark import build_brain
+    from brain.trainer import ModelTrainer
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        brain = build_brain(intents, **brain_options)
+        for name in ("bundle_path", "vocab_path", "intents_path", "artifacts_manifest_path"):
+            setattr(brain, name, Path(tmp, name))
+        trainer = ModelTrainer(brain)
+        trainer.feature_cache_dir = Path(tmp, "features")
+        trainer.checkpoint_path = Path(tmp, "checkpoint.bundle")
+        trainer.build_cache_dir = Path(tmp, "builds")
+        try:
+            yield brain, trainer
+        finally:
+            # A loaded bundle is memory-mapped and must be released before the directory goes
+            brain.model = None
+
 def test_all_features():
     print("🧪 Testing Aetherium Features...\n")
     
@@ -160,6 +183,610 @@ def test_cli_commands():
     except ImportError as e:
         print(f"❌ Could not import CLI functions: {e}")
 
+def test_batch_prediction_matches_single():
+    """Batched intent prediction should agree with the single-input path"""
+    import numpy as np
+    from brain import NeuralNetwork
+    
+    brain = AetheriumBrain(cache_size=0)
+    np.random.seed(0)
+    brain.model = NeuralNetwork(len(brain.vocab), 8, len(brain.intents))
+    
+    phrases = ["ipconfig", "list files", "system info", "hello there",
+               "ping address", "task list", "", "unknown words here"]
+    batch = brain.predict_intents(phrases)
+    single = [brain.predict_intent(phrase) for phrase in phrases]
+    
+    assert [r["tag"] for r in batch] == [r["tag"] for r in single]
+    assert brain.predict_intents([]) == []
+
+def test_prediction_cache_invalidation():
+    """Repeated inputs hit the cache until the model weights are swapped"""
+    from brain import NeuralNetwork
+    
+    brain = AetheriumBrain(cache_size=2)
+    brain.predict_intent("list files")
+    brain.predict_intent("List   FILES")
+    assert brain.cache_stats()["hits"] == 1
+    
+    brain.predict_intents(["system info", "task list"])
+    assert brain.cache_stats()["evictions"] == 1
+    
+    brain.model = NeuralNetwork(len(brain.vocab), 8, len(brain.intents))
+    assert brain.cache_stats()["size"] == 0
+    brain.predict_intent("task list")
+    assert brain.cache_stats()["misses"] == 4
+
+def test_concurrent_inference_is_deterministic():
+    """N threads sharing one brain get the same intents as a sequential run"""
+    import threading
+    import numpy as np
+    from brain import NeuralNetwork
+    
+    brain = AetheriumBrain(cache_size=16)
+    np.random.seed(1)
+    brain.model = NeuralNetwork(len(brain.vocab), 8, len(brain.intents))
+    phrases = [p for intent in brain.intents for p in intent["patterns"][:5]]
+    phrases += [f"{p} please now" for p in phrases]
+    expected = [r["tag"] for r in brain.predict_intents(phrases)]
+    
+    failures = []
+    def worker(offset):
+        for i in range(3):
+            rotated = phrases[offset:] + phrases[:offset]
+            tags = [r["tag"] for r in brain.predict_intents(rotated)]
+            if tags != expected[offset:] + expected[:offset]:
+                failures.append(offset)
+            if [brain.predict_intent(p)["tag"] for p in rotated[:20]] != tags[:20]:
+                failures.append(offset)
+    
+    threads = [threading.Thread(target=worker, args=(n * 7,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert not failures
+    assert [r["tag"] for r in brain.predict_concurrent(phrases, workers=4, chunk_size=32)] == expected
+    brain.close()
+
+def test_model_bundle_roundtrip():
+    """Model bundles store weights and metadata without pickle"""
+    import numpy as np
+    from brain.bundle import save_bundle, load_bundle
+    
+    arrays = {"weights1": np.random.randn(5, 3), "bias1": np.zeros((1, 3)), "empty": np.zeros((0, 2))}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "model.bundle")
+        save_bundle(path, arrays, {"vocab": {"dir": 0}})
+        loaded, meta = load_bundle(path)
+        assert meta["vocab"] == {"dir": 0}
+        for name, array in arrays.items():
+            assert np.array_equal(loaded[name], array)
+        del loaded
+
+def test_legacy_model_converts_and_loads():
+    """A pickled .npy model with its JSON files migrates to a bundle that loads with the legacy tokenizer"""
+    import json
+    import numpy as np
+    
+    vocab = {"dir": 0, "files?": 1, "ping": 2}
+    intents = [{"tag": "list_files", "patterns": ["dir files?"], "responses": ["Listing..."]},
+               {"tag": "network", "patterns": ["ping"], "responses": ["Pinging..."]}]
+    weights = {"weights1": np.random.randn(3, 4), "weights2": np.random.randn(4, 2),
+               "bias1": np.zeros((1, 4)), "bias2": np.zeros((1, 2))}
+    with tempfile.TemporaryDirectory() as tmp:
+        brain = AetheriumBrain(autoload=False)
+        brain.model_path = Path(tmp) / "model.npy"
+        brain.bundle_path = Path(tmp) / "model.bundle"
+        brain.vocab_path = Path(tmp) / "vocab.json"
+        brain.intents_path = Path(tmp) / "intents.json"
+        np.save(brain.model_path, weights, allow_pickle=True)
+        brain.vocab_path.write_text(json.dumps(vocab))
+        brain.intents_path.write_text(json.dumps({"intents": intents}))
+        
+        brain.load_model()
+        assert brain.bundle_path.exists()
+        assert brain.vocab == vocab and brain.intents == intents
+        assert brain.tokenizer.tokenize("Dir FILES?") == ["dir", "files?"]
+        assert np.allclose(brain.model.weights1, weights["weights1"])
+        brain.model = None
+
+def test_fallback_rule_priority():
+    """Compiled fallback rules keep the original substring and priority semantics"""
+    brain = AetheriumBrain()
+    expected = {
+        "show content": "list_files",      # 'show' outranks 'show content'
+        "this": "greeting",                # substring match on 'hi'
+        "boot time": "system_uptime",
+        "run netstat": "command_execution",
+        "zzz": "unknown",
+    }
+    for text, tag in expected.items():
+        assert brain.windows_rule_based_fallback(text)["tag"] == tag
+    assert brain.windows_rule_based_fallback("run netstat")["response"] == "Executing netstat command..."
+
+def test_softmax_head_with_adam_learns():
+    """Softmax outputs are a distribution and Adam reduces the cross-entropy"""
+    import numpy as np
+    from brain.features import SparseMatrix
+    from brain.model import NeuralNetwork
+    from brain.optim import make_optimizer
+    from brain.trainer import ModelTrainer
+    
+    X = SparseMatrix.from_rows([([0], [1.0]), ([1], [1.0]), ([2], [1.0])], 3)
+    labels = np.array([0, 1, 2])
+    np.random.seed(0)
+    model = NeuralNetwork(3, 4, 3, output="softmax")
+    assert np.allclose(model.predict(X).sum(axis=1), 1.0)
+    
+    trainer = ModelTrainer(None)
+    optimizer = make_optimizer("adam", 0.05)
+    first = trainer.train_step(model, X, labels, optimizer)
+    for _ in range(200):
+        last = trainer.train_step(model, X, labels, optimizer)
+    assert last < first
+    assert trainer.evaluate(model, X, labels)[1] == 1.0
+
+def test_early_stopping_restores_best_weights():
+    """Stratified hold-out, warmup before tracking, patience, and the best epoch's weights kept"""
+    import numpy as np
+    from brain.benchmark import synthetic_intents
+    
+    with scratch_trainer(synthetic_intents(60, 3, patterns_per_intent=8)) as (brain, trainer):
+        snapshots = []
+        evaluate = trainer.evaluate
+        def recording_evaluate(model, X, labels):
+            snapshots.append(model.weights2.copy())
+            return evaluate(model, X, labels)
+        trainer.evaluate = recording_evaluate
+        
+        # min_delta is unreachable, so the first tracked epoch stays the best
+        result = trainer.train_model(epochs=50, seed=0, validation_split=0.25, patience=3, min_delta=10.0,
+                                     min_epochs=5, optimizer="adam", learning_rate=0.01)
+        
+        # Two of each intent's eight patterns are held out
+        assert result["val_samples"] == 2 * len(brain.intents)
+        assert result["stopped_early"] and result["best_epoch"] == 5 and result["epochs_run"] == 9
+        assert np.array_equal(brain.model.weights2, snapshots[5])
+        assert not np.array_equal(brain.model.weights2, snapshots[-1])
+
+def test_row_subset_batches_match_copied_subset():
+    """Batching a row subset of X yields the same batches as batching a copy of those rows"""
+    import numpy as np
+    from brain.features import SparseMatrix
+    from brain.trainer import ModelTrainer
+    
+    X = SparseMatrix.from_rows((([row % 7, 7 + row % 3], [1, row]) for row in range(40)), 10)
+    labels = np.arange(40) % 4
+    rows = np.array([1, 2, 5, 8, 13, 21, 34, 39])
+    trainer = ModelTrainer(None)
+    
+    copied = list(trainer.iterate_batches(X.take(rows), labels[rows], 3, True, np.random.default_rng(7)))
+    subset = list(trainer.iterate_batches(X, labels, 3, True, np.random.default_rng(7), rows))
+    assert len(copied) == len(subset) == 3
+    for (X_copy, labels_copy), (X_batch, labels_batch) in zip(copied, subset):
+        assert np.array_equal(X_copy.toarray(), X_batch.toarray())
+        assert np.array_equal(labels_copy, labels_batch)
+
+def test_resumed_training_matches_uninterrupted():
+    """A run resumed from a checkpoint ends with the same weights as one that never stopped"""
+    import numpy as np
+    from brain.benchmark import synthetic_intents
+    
+    with scratch_trainer(synthetic_intents(60, 3, patterns_per_intent=8)) as (brain, trainer):
+        settings = dict(epochs=30, batch_size=4, seed=1, validation_split=0.2, optimizer="adam",
+                        learning_rate=0.01, checkpoint_every=10)
+        
+        trainer.train_model(**settings)
+        expected = brain.model.weights2.copy()
+        # The seed alone fixes the model, whatever the global numpy state
+        np.random.seed(123)
+        trainer.train_model(**settings)
+        assert np.array_equal(brain.model.weights2, expected)
+        
+        # Preempt the run partway through epoch 25, after the epoch-20 checkpoint
+        train_step = trainer.train_step
+        calls = []
+        def preempted_step(*args):
+            calls.append(1)
+            if len(calls) > 25 * 5:
+                raise KeyboardInterrupt
+            return train_step(*args)
+        trainer.train_step = preempted_step
+        try:
+            trainer.train_model(**settings)
+        except KeyboardInterrupt:
+            pass
+        trainer.train_step = train_step
+        assert trainer.checkpoint_path.exists()
+        
+        trainer.train_model(resume=True, **settings)
+        assert np.array_equal(brain.model.weights2, expected)
+        assert not trainer.checkpoint_path.exists()
+
+def test_incremental_update_grows_and_reorders_weights():
+    """update_model appends words, follows the source's intent order and keeps startup trusting its files"""
+    import copy
+    import numpy as np
+    
+    intents = [{"tag": tag, "patterns": [f"{tag} one", f"{tag} two"], "responses": [tag]}
+               for tag in ("alpha", "beta", "gamma")]
+    source = [copy.deepcopy(intents[1]), copy.deepcopy(intents[0]),
+              {"tag": "delta", "patterns": ["delta zebra"], "responses": ["delta"]}]
+    source[1]["patterns"].append("alpha yak")
+    
+    for feature_dim in (None, 32):
+        with scratch_trainer(copy.deepcopy(intents), feature_dim=feature_dim) as (brain, trainer):
+            old_vocab = dict(brain.vocab)
+            old = brain.model
+            # Startup recorded the new source data before the old bundle was loaded
+            brain.intents, old_intents = source, brain.intents
+            brain.save_data(bundle=False)
+            brain.write_artifacts_manifest("source-hash")
+            brain.intents = old_intents
+            
+            result = trainer.update_model(source, epochs=0, seed=0)
+            model = brain.model
+            
+            assert [intent["tag"] for intent in brain.intents] == ["beta", "alpha", "delta"]
+            assert result["new_intents"] == 1 and result["removed_intents"] == 1
+            assert all(brain.vocab[word] == idx for word, idx in old_vocab.items())
+            assert sorted(set(brain.vocab) - set(old_vocab)) == ["delta", "yak", "zebra"]
+            assert min(brain.vocab[word] for word in ("delta", "yak", "zebra")) == len(old_vocab)
+            if feature_dim:
+                # Hashed inputs have a fixed width, so weights1 gains no rows
+                assert model.weights1.shape == old.weights1.shape
+            else:
+                assert model.weights1.shape[0] == len(old_vocab) + 3
+                assert not model.weights1[len(old_vocab):].any()
+            assert np.array_equal(model.weights2[:, 0], old.weights2[:, 1])
+            assert np.array_equal(model.weights2[:, 1], old.weights2[:, 0])
+            assert model.weights2.shape[1] == 3 and model.bias2[0, 2] == -4.0
+            # Next startup: the recorded files and the updated bundle are both accepted
+            updated_vocab = dict(brain.vocab)
+            manifest = brain.load_cached_artifacts("source-hash")
+            assert manifest is not None and brain.vocab == updated_vocab
+            assert brain.load_bundle(expected_data_hash=manifest["data_hash"], expected_features=brain.feature_spec())
+
+def test_brain_from_config_matches_settings():
+    """The CLI and GUI build their brain from MODEL_CONFIG, so both expect the same bundle features"""
+    from config import MODEL_CONFIG
+    
+    config = dict(MODEL_CONFIG, feature_hashing_dim=64, feature_bigrams=True, tokenizer_stem=True,
+                  precision="float32", cache_size=7)
+    brain = AetheriumBrain.from_config(config, autoload=False)
+    assert brain.input_size() == 64 and brain.precision == "float32"
+    assert brain.feature_spec() == AetheriumBrain(autoload=False, feature_dim=64, feature_bigrams=True,
+                                                  stem=True).feature_spec()
+    assert brain.feature_spec()["tokenizer"]["stem"]
+
+def test_build_cache_hits_misses_and_prunes():
+    """Unchanged inputs restore the identical bundle; force, new settings or new data retrain"""
+    import copy
+    from brain.benchmark import synthetic_intents
+    
+    with scratch_trainer(synthetic_intents(30, 3, patterns_per_intent=6)) as (brain, trainer):
+        settings = dict(epochs=5, seed=0, batch_size=8, build_cache=True)
+        
+        first = trainer.train_model(**settings)
+        trained = brain.bundle_path.read_bytes()
+        brain.bundle_path.unlink()
+        cached = trainer.train_model(**settings)
+        assert not first.get("cached") and cached["cached"] and cached["build_key"] == brain.training_info["build_key"]
+        assert brain.bundle_path.read_bytes() == trained
+        
+        assert not trainer.train_model(force=True, **settings).get("cached")
+        assert not trainer.train_model(**dict(settings, learning_rate=0.05)).get("cached")
+        brain.intents = copy.deepcopy(brain.intents)
+        brain.intents[0]["patterns"].append("w0 w1")
+        assert not trainer.train_model(**settings).get("cached")
+        
+        # The newest `keep` entries survive
+        for path in trainer.build_cache_dir.glob("*.bundle"):
+            path.unlink()
+        for idx in range(4):
+            key = str(idx) * 64
+            trainer.store_build(key, keep=2)
+            os.utime(trainer.build_cache_path(key), (idx, idx))
+        assert sorted(path.name for path in trainer.build_cache_dir.glob("*.bundle")) == \
+            sorted(trainer.build_cache_path(str(idx) * 64).name for idx in (2, 3))
+
+def test_mapped_bundle_is_released_before_replace(monkeypatch):
+    """Windows cannot replace a mapped file, so restore_build and update_model drop the mapping first"""
+    import copy
+    import weakref
+    from brain.benchmark import synthetic_intents
+    
+    with scratch_trainer(synthetic_intents(30, 3, patterns_per_intent=6)) as (brain, trainer):
+        settings = dict(epochs=2, seed=0, batch_size=8, build_cache=True)
+        trainer.train_model(**settings)
+        
+        mapped = []
+        replace = os.replace
+        def checked_replace(src, dst):
+            if Path(dst) == brain.bundle_path:
+                assert all(ref() is None for ref in mapped), "bundle replaced while still mapped"
+            replace(src, dst)
+        monkeypatch.setattr(os, "replace", checked_replace)
+        def map_bundle():
+            assert brain.load_bundle()
+            mapped.extend(weakref.ref(array) for array in brain.model.weight_arrays().values())
+        
+        map_bundle()
+        assert trainer.train_model(**settings)["cached"]
+        map_bundle()
+        source = copy.deepcopy(brain.intents) + [{"tag": "extra", "patterns": ["extra words"], "responses": ["extra"]}]
+        assert trainer.update_model(source, epochs=1, seed=0)["new_intents"] == 1
+
+def test_quantized_precisions_agree_with_float64():
+    """int8 weights dequantize within half a step; float32/int8 models and int8 bundles predict like float64"""
+    import numpy as np
+    from brain.benchmark import build_brain, synthetic_intents
+    from brain.model import NeuralNetwork, quantize_columns
+    from brain.trainer import ModelTrainer
+    
+    weights = np.random.default_rng(0).standard_normal((50, 6)) * np.array([0.01, 0.1, 1, 10, 100, 0])
+    quantized, scale = quantize_columns(weights)
+    assert quantized.dtype == np.int8 and scale.shape == (1, 6)
+    assert np.all(np.abs(quantized * scale.astype(np.float64) - weights) <= scale / 2 + 1e-9)
+    
+    brain = build_brain(synthetic_intents(200, 8, patterns_per_intent=10))
+    X = brain.texts_to_matrix([pattern for intent in brain.intents for pattern in intent["patterns"]])
+    reference = brain.model.predict(X)
+    for precision, min_agreement in (("float32", 1.0), ("int8", 0.95)):
+        output = brain.model.to_precision(precision).predict(X)
+        assert np.mean(np.argmax(output, axis=1) == np.argmax(reference, axis=1)) >= min_agreement
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp, "int8.bundle")
+        brain.export_bundle(path, precision="int8")
+        loaded = AetheriumBrain(cache_size=0, precision="int8", autoload=False)
+        assert loaded.load_bundle(path)
+        assert loaded.model.weights1.dtype == np.int8 and loaded.model.precision == "int8"
+        # The sparse path matches the dense product and stays close to float64
+        sparse = loaded.model.predict(X)
+        assert np.allclose(sparse, loaded.model.predict(X.toarray()), atol=1e-5)
+        assert np.max(np.abs(sparse - reference)) < 0.02
+        loaded.model = None
+        
+        # An int8 brain over a float64 bundle reports against the stored float64 weights;
+        # an untrained network has close scores, so int8 rounding flips some of them
+        brain.model = NeuralNetwork(X.shape[1], 16, len(brain.intents), rng=np.random.default_rng(1))
+        reference = brain.model.predict(X)
+        path = Path(tmp, "float64.bundle")
+        brain.export_bundle(path)
+        loaded.bundle_path = path
+        assert loaded.load_bundle() and loaded.model.precision == "int8"
+        assert np.array_equal(loaded.stored_model().weights1, brain.model.weights1)
+        report = {row["precision"]: row for row in ModelTrainer(loaded).precision_report(repeats=1)}
+        int8_agreement = np.mean(np.argmax(loaded.model.predict(X), axis=1) == np.argmax(reference, axis=1))
+        assert int8_agreement < 1.0
+        assert report["float64"]["agreement"] == 1.0
+        assert report["int8"]["agreement"] == int8_agreement
+        loaded.model = None
+
+def test_pattern_index_exact_matches():
+    """Unambiguous training patterns resolve without the network; the bundle carries the index"""
+    from brain.benchmark import build_brain
+    
+    brain = build_brain([
+        {"tag": "files", "patterns": ["list files", "ping"], "responses": ["Listing..."]},
+        {"tag": "network", "patterns": ["check network", "ping"], "responses": ["Pinging..."]}
+    ])
+    index = brain.get_pattern_index()
+    assert index == {"list files": 0, "check network": 1}
+    
+    network = brain.model
+    calls = []
+    class CountingModel:
+        def predict(self, X):
+            calls.append(X.shape[0])
+            return network.predict(X)
+    brain.model = CountingModel()
+    assert brain.predict_intent("List  FILES!")["tag"] == "files"
+    assert calls == []
+    brain.predict_intent("ping")
+    assert calls == [1]
+    assert brain.index_stats()["hits"] == 1 and brain.index_stats()["lookups"] == 2
+    
+    brain.model = network
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp, "model.bundle")
+        brain.export_bundle(path)
+        loaded = AetheriumBrain(cache_size=0, autoload=False)
+        loaded.load_bundle(path)
+        stored = loaded.pattern_index
+        assert stored == index and loaded.get_pattern_index() is stored
+        loaded.model = None
+
+def test_feature_cache_is_pruned():
+    """Each new featurized training set prunes the cache to the most recently used entries"""
+    import os
+    from brain.benchmark import build_brain, synthetic_intents
+    from brain.trainer import ModelTrainer
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        trainer = ModelTrainer(None)
+        trainer.feature_cache_dir = Path(tmp)
+        paths = []
+        for seed in range(4):
+            trainer.brain = build_brain(synthetic_intents(20, 2, patterns_per_intent=4, seed=seed))
+            X, labels = trainer.load_training_matrix(keep=2)
+            paths.append(trainer.feature_cache_path())
+            os.utime(paths[-1], (seed, seed))
+            del X, labels
+        assert sorted(Path(tmp).glob("*.bundle")) == sorted(paths[2:])
+
+def test_chat_dispatch_with_trained_bundle(tmp_path, monkeypatch):
+    """A trained bundle does not take over chat: dispatch still gets the handler tags"""
+    import shutil
+    import main
+    from brain.trainer import ModelTrainer
+    from commands import list_files
+    
+    data_dir = tmp_path / "brain" / "data"
+    data_dir.mkdir(parents=True)
+    for name in ("combined_windows_commands.json", "fallback_rules.json"):
+        shutil.copy(os.path.join(os.path.dirname(os.path.abspath(__file__)), "brain", "data", name), data_dir)
+    monkeypatch.chdir(tmp_path)
+    
+    trainer = ModelTrainer(AetheriumBrain(cache_size=0))
+    trainer.train_model(epochs=2, seed=0)
+    assert trainer.brain.bundle_path.exists()
+    trainer.brain.model = None
+    
+    monkeypatch.setattr(main, "_brain", None)
+    monkeypatch.setattr(main, "_trainer", None)
+    assert main.process_command("list files") == list_files(".")
+    # Commands that need the network still get the trained model
+    brain = main.get_brain()
+    assert brain.load_trained_model() and brain.model.weights2.shape[1] == len(brain.intents)
+    brain.model = None
+
+def test_incremental_train_has_no_stale_model_warning(tmp_path, monkeypatch, capsys):
+    """train --incremental expects new source data, so it must not tell the user to retrain"""
+    import json
+    import shutil
+    import main
+    from brain.trainer import ModelTrainer
+    
+    data_dir = tmp_path / "brain" / "data"
+    data_dir.mkdir(parents=True)
+    for name in ("combined_windows_commands.json", "fallback_rules.json"):
+        shutil.copy(os.path.join(os.path.dirname(os.path.abspath(__file__)), "brain", "data", name), data_dir)
+    monkeypatch.chdir(tmp_path)
+    ModelTrainer(AetheriumBrain(cache_size=0)).train_model(epochs=2, seed=0)
+    
+    source = data_dir / "combined_windows_commands.json"
+    data = json.loads(source.read_text())
+    data["intents"][0]["patterns"].append("zebra yak phrase")
+    source.write_text(json.dumps(data))
+    monkeypatch.setattr(main, "_brain", None)
+    monkeypatch.setattr(main, "_trainer", None)
+    capsys.readouterr()
+    main.train_model(incremental=True)
+    output = capsys.readouterr().out
+    assert "retrain" not in output and "Incremental update complete" in output
+    main.get_brain().model = None
+
+def test_hashed_features_have_fixed_width():
+    """Hashed features keep the input width fixed and need no vocabulary"""
+    brain = AetheriumBrain(cache_size=0, autoload=False, feature_dim=64, feature_bigrams=True)
+    assert brain.input_size() == 64
+    matrix = brain.texts_to_matrix(["list files", "a word never seen before", ""])
+    assert matrix.shape == (3, 64)
+    assert matrix.indices.max() < 64
+    # Same words, same buckets and signs
+    assert brain.text_to_indices("Show IP config?") == brain.text_to_indices("show ip config")
+
+def test_tokenizer_normalizes_punctuation():
+    """Case and surrounding punctuation do not create new tokens; inner dots survive"""
+    from brain.tokenizer import Tokenizer
+    
+    tokenizer = Tokenizer()
+    assert tokenizer.tokenize("List FILES?") == tokenizer.tokenize("list files!") == ["list", "files"]
+    assert tokenizer.tokenize("open notes.txt, please") == ["open", "notes.txt", "please"]
+    assert Tokenizer(stem=True).tokenize("listing directories") == ["list", "directory"]
+    assert AetheriumBrain().windows_rule_based_fallback("run netstat!")["response"] == "Executing netstat command..."
+
+def test_data_generator_is_deterministic():
+    """Seeded generation is reproducible, leaves base_intents alone and agrees with its vocab"""
+    import copy
+    import json
+    from brain.data_generator import TrainingDataGenerator
+    
+    generator = TrainingDataGenerator(seed=3)
+    base = copy.deepcopy(generator.base_intents)
+    build = generator.build()
+    generator.generate_training_data()
+    assert generator.base_intents == base
+    
+    again = TrainingDataGenerator(seed=3).build()
+    assert json.dumps(again["intents"]) == json.dumps(build["intents"])
+    words = {word for intent in build["intents"] for pattern in intent["patterns"] for word in pattern.lower().split()}
+    assert words == set(build["vocab"])
+    assert build["matrix"].shape == (len(build["labels"]), len(build["vocab"]))
+    
+    # A budget caps template variants but keeps every base pattern and every token
+    budgeted = TrainingDataGenerator(seed=3, budget=20).build()
+    assert len(budgeted["labels"]) < len(build["labels"])
+    assert budgeted["vocab"] == build["vocab"]
+    for intent in budgeted["intents"]:
+        assert set(base[intent["tag"]]["patterns"]) <= set(intent["patterns"])
+
+def test_training_telemetry_records():
+    """Telemetry writes run/epoch/summary JSON lines and calls the callback per epoch"""
+    import json
+    from brain.telemetry import TrainingTelemetry
+    
+    seen = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "train.jsonl")
+        telemetry = TrainingTelemetry(path, seen.append)
+        telemetry.start(train_samples=100, vocab_size=10, intents=2, nnz=300)
+        telemetry.record_epoch(0, 0.5, 100, 0.25, val_accuracy=0.5)
+        telemetry.record_epoch(1, 0.25, 100, 0.125, val_accuracy=0.75)
+        summary = telemetry.close()
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+    
+    assert [r["type"] for r in records] == ["run", "epoch", "epoch", "summary"]
+    assert [r["epoch"] for r in seen] == [0, 1]
+    assert seen[1]["samples_per_second"] == 400
+    assert summary["best_val_accuracy"] == 0.75 and summary["final_loss"] == 0.125
+
+def test_merge_intents_reports_conflicts():
+    """Merging dedups patterns per tag, combines repeated tags and reports cross-tag patterns"""
+    from brain.tokenizer import Tokenizer
+    from windows_data_merger import merge_intents
+    
+    sources = [
+        ("a.json", [{"tag": "net", "patterns": ["Ping", "ping?", "ipconfig"], "responses": ["n"]}]),
+        ("b.json", [{"tag": "net", "patterns": ["netstat"], "responses": ["n"]},
+                    {"tag": "tools", "patterns": ["ping"], "responses": ["t"]}])
+    ]
+    merged, report = merge_intents(sources, Tokenizer())
+    patterns = {intent["tag"]: intent["patterns"] for intent in merged["intents"]}
+    
+    assert patterns == {"net": ["Ping", "ipconfig", "netstat"], "tools": ["ping"]}
+    assert report["duplicate_patterns"] == 1
+    assert report["duplicate_tags"] == {"net": ["a.json", "b.json"]}
+    assert [(c["pattern"], c["kept"]) for c in report["conflicts"]] == [("ping", "net")]
+    
+    merged, _ = merge_intents(sources, Tokenizer(), drop_conflicts=True)
+    assert [intent["patterns"] for intent in merged["intents"]] == [["Ping", "ipconfig", "netstat"], []]
+
+def test_build_data_rebuilds_only_changed_stages():
+    """Stages rerun when their inputs change, and unchanged dependency output stops the rebuild"""
+    from data_pipeline import Stage, build_data
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        a, b, c = (os.path.join(tmp, name) for name in ("a.txt", "b.txt", "c.txt"))
+        manifest = os.path.join(tmp, "manifest.json")
+        stages = [
+            Stage("second", "shutil", "copyfile", [b], [c], {"src": b, "dst": c}),
+            Stage("first", "shutil", "copyfile", [a], [b], {"src": a, "dst": b})
+        ]
+        with open(a, 'w') as f:
+            f.write("one")
+        
+        first = build_data(stages, workers=2, manifest_path=manifest)
+        second = build_data(stages, workers=2, manifest_path=manifest)
+        with open(a, 'w') as f:
+            f.write("two")
+        third = build_data(stages, workers=2, manifest_path=manifest)
+        with open(c) as f:
+            assert f.read() == "two"
+        os.remove(c)
+        fourth = build_data(stages, workers=2, manifest_path=manifest)
+    
+    statuses = lambda results: [results[name]["status"] for name in ("first", "second")]
+    assert statuses(first) == ["built", "built"]
+    assert statuses(second) == ["cached", "cached"]
+    assert statuses(third) == ["built", "built"]
+    assert statuses(fourth) == ["cached", "built"]
+
 if __name__ == "__main__":
     success = test_all_features()
     test_cli_commands()
@@ -1,34 +1,177 @@
 # windows_data_merger.py
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from brain.hashing import sha256_bytes, sha256_file
+from brain.tokenizer import Tokenizer
 
-def merge_windows_data():
-    """Merge all Windows command training data"""
-    data_files = [
-        "brain/data/real_windows_commands.json",
-        "brain/data/powershell_commands.json",
-        "brain/data/windows_admin_commands.json"
+DATA_FILES = [
+    "brain/data/real_windows_commands.json",
+    "brain/data/powershell_commands.json",
+    "brain/data/windows_admin_commands.json"
+]
+# Site-specific sources are merged after the built-in ones, in file name order
+SITE_SOURCES_DIR = Path("brain/data/sources")
+OUTPUT_PATH = Path("brain/data/combined_windows_commands.json")
+MANIFEST_PATH = Path("brain/data/merge_manifest.json")
+REPORT_PATH = Path("brain/data/merge_report.json")
+MANIFEST_VERSION = 2
+PARALLEL_MIN_SOURCES = 16
+
+def source_files():
+    return [Path(path) for path in DATA_FILES] + sorted(SITE_SOURCES_DIR.glob("*.json"))
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get("version") == MANIFEST_VERSION else {}
+
+def source_state(path, cached=None):
+    """Size, mtime and sha256 of a file; the manifest's hash is reused while size and mtime match"""
+    stat = path.stat()
+    state = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if cached and cached.get("size") == state["size"] and cached.get("mtime_ns") == state["mtime_ns"]:
+        return dict(state, sha256=cached["sha256"])
+    return dict(state, sha256=sha256_file(path))
+
+def parse_source(path):
+    """Parse one source file; runs inside a worker process for large merges"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)["intents"], None
+    except Exception as e:
+        return None, str(e)
+
+def merge_intents(sources, tokenizer, drop_conflicts=False):
+    """Merge (source, intents) pairs: tags defined twice are combined, patterns deduplicated
+    per tag, and patterns claimed by several tags reported as conflicts"""
+    merged = {}
+    tag_sources = {}
+    tag_keys = {}
+    owners = {}
+    duplicates = 0
+
+    for source, intents in sources:
+        for intent in intents:
+            tag = intent["tag"]
+            target = merged.setdefault(tag, {"tag": tag, "patterns": [], "responses": []})
+            tag_sources.setdefault(tag, []).append(source)
+            keys = tag_keys.setdefault(tag, set())
+
+            for response in intent.get("responses", []):
+                if response not in target["responses"]:
+                    target["responses"].append(response)
+
+            for pattern in intent["patterns"]:
+                key = tokenizer.normalize(pattern)
+                if key in keys:
+                    duplicates += 1
+                    continue
+                claims = owners.setdefault(key, [])
+                claims.append({"tag": tag, "source": source, "pattern": pattern})
+                if drop_conflicts and claims[0]["tag"] != tag:
+                    continue
+                keys.add(key)
+                target["patterns"].append(pattern)
+
+    conflicts = [
+        {"pattern": key, "kept": claims[0]["tag"], "claims": claims}
+        for key, claims in owners.items() if len({claim["tag"] for claim in claims}) > 1
     ]
-    
-    merged_data = {"intents": []}
-    
-    for file_path in data_files:
-        if Path(file_path).exists():
-            try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    merged_data["intents"].extend(data["intents"])
-            except Exception as e:
-                print(f"⚠️  Error loading {file_path}: {e}")
-    
-    # Save merged data
-    with open("brain/data/combined_windows_commands.json", 'w') as f:
-        json.dump(merged_data, f, indent=2)
-    
+    report = {
+        "duplicate_patterns": duplicates,
+        "duplicate_tags": {tag: sources for tag, sources in tag_sources.items() if len(sources) > 1},
+        "conflicts": conflicts,
+        "conflicts_dropped": drop_conflicts
+    }
+    return {"intents": list(merged.values())}, report
+
+def write_json(path, data):
+    """Write JSON atomically so readers never see a half-written file"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+def merge_windows_data(force=False, drop_conflicts=False, workers=None):
+    """Merge all Windows command training data
+
+    The manifest records each source's size, mtime and hash. When none of
+    them, the settings or the combined file changed, nothing is read or
+    parsed and None is returned. Otherwise every source is parsed and merged,
+    and the combined file is only rewritten when its content changes, so
+    downstream vocab and model caches stay valid.
+    """
+    tokenizer = Tokenizer()
+    manifest = {} if force else load_manifest()
+    cached_sources = manifest.get("sources", {})
+    paths = [path for path in source_files() if path.exists()]
+    states = {str(path): source_state(path, cached_sources.get(str(path))) for path in paths}
+    settings = {"tokenizer": tokenizer.spec(), "drop_conflicts": drop_conflicts}
+    changed = [source for source, state in states.items()
+               if cached_sources.get(source, {}).get("sha256") != state["sha256"]]
+    removed = [source for source in cached_sources if source not in states]
+
+    output_state = source_state(OUTPUT_PATH, manifest.get("output")) if OUTPUT_PATH.exists() else None
+    output_current = output_state is not None and output_state["sha256"] == manifest.get("output", {}).get("sha256")
+    if not force and not changed and not removed and output_current and manifest.get("settings") == settings:
+        print(f"✅ Windows command data up to date ({len(paths)} sources unchanged)")
+        return None
+
+    # JSON parsing holds the GIL, so only a process pool parses in parallel;
+    # it pays off once there are many site sources
+    if len(paths) >= PARALLEL_MIN_SOURCES and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = list(pool.map(parse_source, paths))
+    else:
+        parsed = [parse_source(path) for path in paths]
+
+    sources = []
+    for path, (intents, error) in zip(paths, parsed):
+        if error is None:
+            sources.append((str(path), intents))
+        else:
+            print(f"⚠️  Error loading {path}: {error}")
+            # Not recorded, so the next run tries this source again
+            del states[str(path)]
+
+    merged_data, report = merge_intents(sources, tokenizer, drop_conflicts)
+
+    output = json.dumps(merged_data, indent=2)
+    if output_state and output_state["sha256"] == sha256_bytes(output.encode('utf-8')):
+        print("✅ Merged data unchanged, keeping the existing combined file")
+    else:
+        write_json(OUTPUT_PATH, merged_data)
+        output_state = source_state(OUTPUT_PATH)
+
+    report["sources"] = {source: {"changed": source in changed, "intents": len(intents)}
+                         for source, intents in sources}
+    write_json(REPORT_PATH, report)
+    write_json(MANIFEST_PATH, {
+        "version": MANIFEST_VERSION,
+        "settings": settings,
+        "sources": states,
+        "output": output_state
+    })
+
     total_patterns = sum(len(intent["patterns"]) for intent in merged_data["intents"])
     print(f"✅ Merged {len(merged_data['intents'])} Windows command categories with {total_patterns} patterns")
-    
+    print(f"   • {len(changed)} sources changed, {len(removed)} removed, {len(paths) - len(changed)} unchanged")
+    print(f"   • {report['duplicate_patterns']} duplicate patterns removed")
+    for tag, tag_sources in report["duplicate_tags"].items():
+        print(f"⚠️  Tag '{tag}' is defined {len(tag_sources)} times ({', '.join(sorted(set(tag_sources)))}), merged")
+    if report["conflicts"]:
+        action = "kept only under the first tag" if drop_conflicts else "kept under every tag"
+        print(f"⚠️  {len(report['conflicts'])} patterns map to different intents ({action}), see {REPORT_PATH}")
+        for conflict in report["conflicts"][:10]:
+            tags = ", ".join(dict.fromkeys(claim["tag"] for claim in conflict["claims"]))
+            print(f"   • '{conflict['pattern']}': {tags}")
+
     return merged_data
 
 if __name__ == "__main__":
-    merge_windows_data()
\ No newline at end of file
+    merge_windows_data()